@@ -15,14 +15,14 @@
 
 """Streamlit frontend for NexDR with real-time log display."""
 
-import html
 import os
 import re
-import subprocess
+import sys
 import threading
-import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from queue import Queue, Empty
+from urllib.parse import urlsplit
 
 import streamlit as st
 import streamlit.components.v1 as components
@@ -49,20 +49,6 @@ st.markdown(
         color: #F44336;
         font-weight: bold;
     }
-    /* Fixed height log container */
-    .log-container {
-        height: 500px;
-        overflow-y: auto;
-        overflow-x: auto;
-        background-color: #ffffff;  /* White background */
-        border: 1px solid #ddd;
-        border-radius: 5px;
-        padding: 15px;
-        font-family: 'Courier New', monospace;
-        font-size: 12px;
-        line-height: 1.4;
-        color: #333;  /* Dark text */
-    }
     /* Fixed height code block */
     div[data-testid="stCodeBlock"] {
         height: 100%;
@@ -88,83 +74,195 @@ st.title("NexDR - Nex Deep Resaerch Agent")
 st.markdown("---")
 
 
-def read_output(pipe, queue):
-    """Read process output in background thread"""
-    try:
-        for line in iter(pipe.readline, ""):
-            if line:
-                queue.put(line)
-        pipe.close()
-    except Exception:
+# Unicode ranges covering most emojis (compiled once; used per log line)
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001f300-\U0001f9ff"  # Various symbols and pictographs
+    "\U0001f600-\U0001f64f"  # Emoticons
+    "\U0001f680-\U0001f6ff"  # Transport and map symbols
+    "\U0001f1e0-\U0001f1ff"  # Flags
+    "\U00002702-\U000027b0"  # Miscellaneous symbols
+    "\U000024c2-\U0001f251"  # Enclosed characters
+    "]+",
+    flags=re.UNICODE,
+)
+
+# Matches report pages named like "xxx_1.html" ... "xxx_50.html"
+_HTML_NUM_RE = re.compile(r".*_(\d{1,2})\.html$")
+
+# Single C-level pass per line, versus html.escape's multiple str.replace scans
+_HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+# Process-wide log bus feeding the SSE endpoint. The Streamlit script thread
+# publishes drained lines; SSE handler threads wait on the condition and push
+# each new line to the browser as a single short frame.
+_LOG_BUS_COND = threading.Condition()
+_LOG_BUS = {
+    "lines": deque(maxlen=1000),  # (text, has_emoji) pairs
+    "total": 0,  # Monotonic count of published lines
+}
+
+
+def _publish_log_lines(batch: list) -> None:
+    """Publish drained log lines to the SSE bus, pre-escaped for HTML"""
+    with _LOG_BUS_COND:
+        for line in batch:
+            _LOG_BUS["lines"].append(
+                (line.translate(_HTML_ESCAPE_TABLE), bool(_EMOJI_RE.search(line)))
+            )
+        _LOG_BUS["total"] += len(batch)
+        _LOG_BUS_COND.notify_all()
+
+
+def _reset_log_bus() -> None:
+    """Clear the SSE bus when a new agent run starts"""
+    with _LOG_BUS_COND:
+        _LOG_BUS["lines"].clear()
+        _LOG_BUS["total"] = 0
+        _LOG_BUS_COND.notify_all()
+
+
+class _LogSSEHandler(BaseHTTPRequestHandler):
+    """Streams log lines as Server-Sent Events on /logs"""
+
+    def log_message(self, format, *args):
+        # Keep per-request logging off the server's stderr
         pass
 
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path != "/logs":
+            self.send_error(404)
+            return
+        key_only = "filter=1" in parts.query
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        seen = 0
+        try:
+            while True:
+                with _LOG_BUS_COND:
+                    if _LOG_BUS["total"] < seen:
+                        seen = 0  # Bus was reset by a new run
+                    if _LOG_BUS["total"] == seen:
+                        _LOG_BUS_COND.wait(timeout=5.0)
+                    available = len(_LOG_BUS["lines"])
+                    new = min(_LOG_BUS["total"] - seen, available)
+                    pending = (
+                        list(_LOG_BUS["lines"])[available - new :] if new else []
+                    )
+                    seen = _LOG_BUS["total"]
+                if not pending:
+                    # Heartbeat comment so dead connections surface as errors
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    continue
+                for line, has_emoji in pending:
+                    if key_only and not has_emoji:
+                        continue
+                    payload = line.rstrip("\n").encode("utf-8", errors="replace")
+                    self.wfile.write(b"data: " + payload + b"\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+@st.cache_resource(show_spinner=False)
+def _start_log_sse_server() -> int:
+    """Start the SSE log server once per process; returns its port"""
+    # Bind where Streamlit itself serves so browsers that are not on this
+    # host (Docker, remote access) can reach the stream too
+    address = st.get_option("server.address") or "0.0.0.0"
+    server = ThreadingHTTPServer((address, 0), _LogSSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
 
 def contains_emoji(text: str) -> bool:
     """Detect if text contains emoji"""
-    # Unicode ranges covering most emojis
-    emoji_pattern = re.compile(
-        "["
-        "\U0001f300-\U0001f9ff"  # Various symbols and pictographs
-        "\U0001f600-\U0001f64f"  # Emoticons
-        "\U0001f680-\U0001f6ff"  # Transport and map symbols
-        "\U0001f1e0-\U0001f1ff"  # Flags
-        "\U00002702-\U000027b0"  # Miscellaneous symbols
-        "\U000024c2-\U0001f251"  # Enclosed characters
-        "]+",
-        flags=re.UNICODE,
-    )
-    return bool(emoji_pattern.search(text))
+    return bool(_EMOJI_RE.search(text))
+
+
+def _scan_html_files(dir_path: str) -> list:
+    """Recursively collect numbered page files via os.scandir (cached DirEntry stats)"""
+    found = []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                found.extend(_scan_html_files(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                m = _HTML_NUM_RE.match(entry.name)
+                if m and 1 <= int(m.group(1)) <= 50:
+                    found.append(entry.path)
+    return found
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _find_html_files_cached(workspace_str: str, workspace_mtime: float) -> list:
+    """Cached recursive page scan; reruns within the TTL skip the walk entirely"""
+    return _scan_html_files(workspace_str)
 
 
 def find_html_files(workspace_path: Path) -> list:
     """Find HTML files ending with _1-50.html in workspace and sort by number"""
-    import re
-
     if not workspace_path or not workspace_path.exists():
         return []
-    pattern = re.compile(r".*_(\d{1,2})\.html$")
-    html_files = []
-    for f in workspace_path.rglob("*.html"):
-        m = pattern.match(f.name)
-        if m:
-            n = int(m.group(1))
-            if 1 <= n <= 50:
-                html_files.append(f)
+    html_files = [
+        Path(p)
+        for p in _find_html_files_cached(
+            str(workspace_path), workspace_path.stat().st_mtime
+        )
+    ]
 
     # Sort by number in filename (ascending)
     def extract_num(f):
-        m = pattern.match(f.name)
+        m = _HTML_NUM_RE.match(f.name)
         return int(m.group(1)) if m else float("inf")
 
     html_files.sort(key=extract_num)
     return html_files
 
 
-def find_report_files(workspace_path: Path, report_format: str) -> list:
-    """Find corresponding report files based on report format"""
-    if not workspace_path or not workspace_path.exists():
+@st.cache_data(ttl=5, show_spinner=False)
+def _find_report_files_cached(workspace_str: str, report_format: str) -> list:
+    """Cached report-file lookup keyed on (workspace, format); returns path strings"""
+    workspace_path = Path(workspace_str)
+    if not workspace_path.exists():
         return []
 
     if report_format == "html":
         # Find html_report.html
         html_report = workspace_path / "html_report.html"
         if html_report.exists():
-            return [html_report]
+            return [str(html_report)]
         return []
     elif report_format == "markdown":
         # Find markdown_report.md
         md_report = workspace_path / "markdown_report.md"
         if md_report.exists():
-            return [md_report]
+            return [str(md_report)]
         return []
     return []
 
 
-def get_latest_workspace() -> Path:
-    """Get the latest workspace directory (absolute path)"""
+def find_report_files(workspace_path: Path, report_format: str) -> list:
+    """Find corresponding report files based on report format"""
+    if not workspace_path:
+        return []
+    return [Path(p) for p in _find_report_files_cached(str(workspace_path), report_format)]
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _latest_workspace_str() -> str:
+    """Cached lookup of the newest workspace dir; avoids a glob+stat per rerun"""
     workspaces_dir = Path(os.getcwd()) / "workspaces"
     if not workspaces_dir.exists():
-        return None
+        return ""
 
     workspace_dirs = sorted(
         workspaces_dir.glob("workspace_*"),
@@ -172,8 +270,35 @@ def get_latest_workspace() -> Path:
         reverse=True,
     )
     if workspace_dirs:
-        return workspace_dirs[0]
-    return None
+        return str(workspace_dirs[0])
+    return ""
+
+
+def get_latest_workspace() -> Path:
+    """Get the latest workspace directory (absolute path)"""
+    latest = _latest_workspace_str()
+    return Path(latest) if latest else None
+
+
+@st.cache_resource(show_spinner=False)
+def _agent_python() -> str:
+    """Resolve the project interpreter once so each run skips the uv wrapper"""
+    import subprocess
+
+    try:
+        return subprocess.check_output(
+            ["uv", "run", "--", "python", "-c", "import sys;print(sys.executable)"],
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return sys.executable
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _read_report(path: str, mtime: float) -> str:
+    """Read a report file, cached by (path, mtime) so reruns skip disk I/O"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
 
 
 # Initialize session state
@@ -183,12 +308,17 @@ if "agent_process" not in st.session_state:
     st.session_state["agent_process"] = None
 if "workspace_path" not in st.session_state:
     st.session_state["workspace_path"] = None
-if "log_queue" not in st.session_state:
-    st.session_state["log_queue"] = None
+if "log_selector" not in st.session_state:
+    st.session_state["log_selector"] = None
+if "log_tail" not in st.session_state:
+    st.session_state["log_tail"] = ""  # Partial line carried between drains
 if "log_lines" not in st.session_state:
-    st.session_state["log_lines"] = []
-if "output_thread" not in st.session_state:
-    st.session_state["output_thread"] = None
+    # maxlen bounds memory; old lines are dropped in O(1) on append
+    st.session_state["log_lines"] = deque(maxlen=1000)
+if "filtered_lines" not in st.session_state:
+    st.session_state["filtered_lines"] = deque(maxlen=1000)  # Lines with emojis
+if "log_gen" not in st.session_state:
+    st.session_state["log_gen"] = 0  # Bumped whenever the log buffers mutate
 if "current_session_started" not in st.session_state:
     st.session_state["current_session_started"] = (
         False  # Mark if agent has been executed in current session
@@ -198,6 +328,124 @@ if "emoji_filter_enabled" not in st.session_state:
 if "report_format" not in st.session_state:
     st.session_state["report_format"] = "html"  # Default: use HTML format
 
+
+def _drain_and_render_logs():
+    """Drain pending subprocess output and render the log container."""
+    # Read new output non-blocking; filter incrementally so display never
+    # re-scans old lines
+    sel = st.session_state["log_selector"]
+    process = st.session_state["agent_process"]
+    if sel and process:
+        # Drain everything available into one buffer, then split once
+        data = b""
+        while sel.select(timeout=0):
+            try:
+                chunk = os.read(process.stdout.fileno(), 65536)
+            except (BlockingIOError, OSError):
+                break
+            if not chunk:
+                # EOF: the process closed its end of the pipe
+                sel.close()
+                st.session_state["log_selector"] = None
+                break
+            data += chunk
+        if data:
+            text = st.session_state["log_tail"] + data.decode(
+                "utf-8", errors="replace"
+            )
+            lines = text.split("\n")
+            st.session_state["log_tail"] = lines.pop()
+            batch = [line + "\n" for line in lines]
+            # deque maxlen handles trimming, no slice-rebuild needed
+            st.session_state["log_lines"].extend(batch)
+            st.session_state["filtered_lines"].extend(
+                line for line in batch if _EMOJI_RE.search(line)
+            )
+            st.session_state["log_gen"] += 1
+            _publish_log_lines(batch)
+
+    # Display logs: the container is filled client-side via SSE, so each new
+    # line is a short frame instead of a full-buffer rerender per tick
+    port = _start_log_sse_server()
+    filter_flag = 1 if st.session_state["emoji_filter_enabled"] else 0
+    # The markup embeds the buffered lines as initial content, so the panel
+    # still shows logs when the browser cannot reach the SSE endpoint; it
+    # is rebuilt only when the buffers change, so idle ticks reuse the
+    # cached string and only active runs pay the re-render
+    component_key = (port, filter_flag, st.session_state["log_gen"])
+    if st.session_state.get("log_component_key") != component_key:
+        st.session_state["log_component_key"] = component_key
+        buffered = (
+            st.session_state["filtered_lines"]
+            if st.session_state["emoji_filter_enabled"]
+            else st.session_state["log_lines"]
+        )
+        initial_text = "".join(
+            line.translate(_HTML_ESCAPE_TABLE) for line in buffered
+        ) or "👈 Real-time logs will appear after running Agent"
+        st.session_state["log_component_html"] = f"""
+    <!-- column-reverse anchors the viewport to the bottom edge, so the
+         browser keeps the newest line in view as content grows without
+         any per-message scroll scripting -->
+    <div id="nexdr-log" style="height:500px; overflow:auto; display:flex;
+         flex-direction:column-reverse; background-color:#ffffff;
+         border:1px solid #ddd; border-radius:5px; padding:15px;
+         font-family:'Courier New', monospace; font-size:12px; line-height:1.4;">
+        <pre id="nexdr-log-pre" style="margin:0; color:#333;">{initial_text}</pre>
+    </div>
+    <script>
+        (function() {{
+            var pre = document.getElementById('nexdr-log-pre');
+            var cleared = false;
+            // Reach the SSE server on whatever host serves this page; a
+            // hardcoded 127.0.0.1 only works when the browser runs there
+            var source = new EventSource(
+                'http://' + window.location.hostname + ':{port}/logs?filter={filter_flag}');
+            source.onmessage = function(e) {{
+                if (!cleared) {{ pre.textContent = ''; cleared = true; }}
+                // Lines arrive pre-escaped server-side
+                pre.insertAdjacentHTML('beforeend', e.data + '\\n');
+            }};
+            source.onerror = function() {{
+                // Endpoint unreachable (proxied port, https page): stop
+                // retrying and fall back to the server-rendered buffer,
+                // which each rerun tick refreshes
+                source.close();
+            }};
+        }})();
+    </script>
+    """
+    components.html(st.session_state["log_component_html"], height=540)
+
+    if st.session_state["log_lines"]:
+        # Recompute the status caption only when the buffers actually changed
+        caption_key = (
+            st.session_state["log_gen"],
+            filter_flag,
+            st.session_state["agent_running"],
+        )
+        if st.session_state.get("log_caption_key") != caption_key:
+            st.session_state["log_caption_key"] = caption_key
+            total_lines = len(st.session_state["log_lines"])
+            prefix = (
+                "📊 Logs updating in real-time..."
+                if st.session_state["agent_running"]
+                else "✅ Execution completed"
+            )
+            if st.session_state["emoji_filter_enabled"]:
+                filtered_count = len(st.session_state["filtered_lines"])
+                st.session_state["log_caption"] = (
+                    "{} | Showing: {}/{} lines (filtered)".format(
+                        prefix, filtered_count, total_lines
+                    )
+                )
+            else:
+                st.session_state["log_caption"] = "{} | Total lines: {}".format(
+                    prefix, total_lines
+                )
+        st.caption(st.session_state["log_caption"])
+
+
 # Main interface
 col1, col2 = st.columns([1, 2])
 
@@ -224,18 +472,24 @@ with col1:
     if not st.session_state["agent_running"]:
         if st.button("🚀 Run Agent", type="primary"):
             if query.strip():
+                # Only needed when actually launching the agent
+                import selectors
+                import subprocess
+
                 # Mark that agent has started in current session
                 st.session_state["current_session_started"] = True
                 # Clear previous workspace path, let system find the latest one
                 st.session_state["workspace_path"] = None
+                _latest_workspace_str.clear()
                 st.session_state["agent_running"] = True
-                st.session_state["log_lines"] = []
-                st.session_state["log_queue"] = Queue()
+                st.session_state["log_lines"] = deque(maxlen=1000)
+                st.session_state["filtered_lines"] = deque(maxlen=1000)
+                st.session_state["log_tail"] = ""
+                _reset_log_bus()
 
-                # Build command
+                # Build command around the pre-resolved interpreter
                 cmd = [
-                    "uv",
-                    "run",
+                    _agent_python(),
                     "quick_start.py",
                     "--query",
                     query,
@@ -243,32 +497,39 @@ with col1:
                     st.session_state["report_format"],
                 ]
 
-                # Start process (non-blocking, no timeout)
+                # Start process (non-blocking, no timeout). Default block
+                # buffering plus a 1 MiB kernel pipe lets the agent run ahead
+                # of the UI without blocking on writes.
+                popen_kwargs = {}
+                if sys.platform == "linux":
+                    popen_kwargs["pipesize"] = 1 << 20  # F_SETPIPE_SZ is Linux-only
                 process = subprocess.Popen(
                     cmd,
                     cwd=os.getcwd(),
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,  # Merge stderr to stdout
-                    text=True,
-                    bufsize=1,  # Line buffering
-                    universal_newlines=True,
+                    bufsize=-1,
+                    close_fds=True,
+                    start_new_session=True,  # Terminate cleanly without leaking children
+                    **popen_kwargs,
                 )
                 st.session_state["agent_process"] = process
 
-                # Start output reading thread
-                output_thread = threading.Thread(
-                    target=read_output,
-                    args=(process.stdout, st.session_state["log_queue"]),
-                    daemon=True,
-                )
-                output_thread.start()
-                st.session_state["output_thread"] = output_thread
+                # Drain stdout non-blocking from the rerun loop; no reader
+                # thread and no per-line queue mutex traffic
+                os.set_blocking(process.stdout.fileno(), False)
+                sel = selectors.DefaultSelector()
+                sel.register(process.stdout, selectors.EVENT_READ)
+                st.session_state["log_selector"] = sel
 
                 st.rerun()
             else:
                 st.warning("⚠️ Please enter a query")
     else:
         if st.button("⏹️ Stop Agent", type="secondary"):
+            if st.session_state["log_selector"]:
+                st.session_state["log_selector"].close()
+                st.session_state["log_selector"] = None
             if st.session_state["agent_process"]:
                 st.session_state["agent_process"].terminate()
                 st.session_state["agent_process"].wait(timeout=5)
@@ -330,95 +591,21 @@ with col2:
             help="When enabled, only shows log lines with emojis (key information)",
         )
 
-    # Read new logs from queue
-    if st.session_state["log_queue"]:
-        try:
-            while True:
-                line = st.session_state["log_queue"].get_nowait()
-                st.session_state["log_lines"].append(line + "\n")
-                # Limit log lines to prevent memory overflow
-                if len(st.session_state["log_lines"]) > 1000:
-                    st.session_state["log_lines"] = st.session_state["log_lines"][
-                        -1000:
-                    ]
-        except Empty:
-            pass
+    # Rerun only this panel while the agent runs; the report preview and
+    # workspace glob stay out of the refresh loop.
+    _log_refresh = 1.0 if st.session_state["agent_running"] else None
 
-    # Display logs - using fixed height container
-    if st.session_state["log_lines"]:
-        # Process logs based on filter settings
-        if st.session_state["emoji_filter_enabled"]:
-            # Only show lines with emojis
-            filtered_lines = [
-                line for line in st.session_state["log_lines"] if contains_emoji(line)
-            ]
-            log_text = "".join(filtered_lines)
-            total_lines = len(st.session_state["log_lines"])
-            filtered_count = len(filtered_lines)
-        else:
-            # Show all logs
-            log_text = "".join(st.session_state["log_lines"])
-            total_lines = len(st.session_state["log_lines"])
-            filtered_count = total_lines
-
-        # HTML escape to prevent injection
-        log_text_escaped = html.escape(log_text)
-
-        # Create fixed height scrolling container with auto-scroll script
-        log_html = f"""
-        <div id="log-container-{id(st.session_state["log_lines"])}" class="log-container">
-            <pre style="margin:0; color:#333;">{log_text_escaped}</pre>
-        </div>
-        <script>
-            // Auto scroll to bottom
-            (function() {{
-                var container = document.getElementById('log-container-{id(st.session_state["log_lines"])}');
-                if (container) {{
-                    container.scrollTop = container.scrollHeight;
-                }}
-            }})();
-        </script>
-        """
-        st.markdown(log_html, unsafe_allow_html=True)
-
-        # Status information
-        if st.session_state["agent_running"]:
-            if st.session_state["emoji_filter_enabled"]:
-                st.caption(
-                    "📊 Logs updating in real-time... | Showing: {}/{} lines (filtered)".format(
-                        filtered_count, total_lines
-                    )
-                )
-            else:
-                st.caption(
-                    "📊 Logs updating in real-time... | Total lines: {}".format(
-                        total_lines
-                    )
-                )
-        else:
-            if st.session_state["emoji_filter_enabled"]:
-                st.caption(
-                    "✅ Execution completed | Showing: {}/{} lines (filtered)".format(
-                        filtered_count, total_lines
-                    )
-                )
-            else:
-                st.caption(
-                    "✅ Execution completed | Total lines: {}".format(total_lines)
-                )
-    else:
-        # Empty state also shows fixed height container
-        st.markdown(
-            '<div class="log-container" style="display:flex; align-items:center; justify-content:center; color:#666;">'
-            "<div>👈 Real-time logs will appear after running Agent</div>"
-            "</div>",
-            unsafe_allow_html=True,
-        )
+    @st.fragment(run_every=_log_refresh)
+    def render_log_panel():
+        _drain_and_render_logs()
+        # Once the agent process exits, trigger one full-script rerun so the
+        # status column and report preview pick up the final state.
+        process = st.session_state["agent_process"]
+        if st.session_state["agent_running"] and process and process.poll() is not None:
+            st.rerun(scope="app")
+
+    render_log_panel()
 
-# Auto-refresh logic
-if st.session_state["agent_running"]:
-    time.sleep(1)  # Refresh every 1 second
-    st.rerun()
 
 # Report preview
 st.markdown("---")
@@ -443,16 +630,24 @@ if st.session_state["current_session_started"] and st.session_state["workspace_p
         # Iterate through all report files and render each
         for idx, report_file in enumerate(report_files, 1):
             try:
-                with open(report_file, "r", encoding="utf-8") as f:
-                    file_content = f.read()
+                # Cached by (path, mtime): unchanged files are not re-read
+                file_content = _read_report(
+                    str(report_file), report_file.stat().st_mtime
+                )
 
                 # Display file title
                 st.markdown(f"### 📄 {idx}. {report_file.name}")
 
                 # Render content based on format
                 if st.session_state["report_format"] == "html":
-                    # Render HTML using iframe
-                    components.html(file_content, height=800, scrolling=True)
+                    # Render HTML using iframe; the inline preview can be
+                    # toggled off to avoid re-embedding large payloads
+                    if st.checkbox(
+                        "🖼️ Inline preview",
+                        value=True,
+                        key=f"preview_{idx}",
+                    ):
+                        components.html(file_content, height=800, scrolling=True)
 
                     # Provide download button and source code view
                     col1, col2 = st.columns([1, 4])
@@ -12,13 +12,159 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import xml.etree.ElementTree as ET
+from functools import lru_cache
 from typing import Annotated
-import arxiv
+
+import aiohttp
+import requests
 from nexdr.agents.deep_research.update_search_resources import update_search_resources
 from nexau.archs.main_sub.agent_context import GlobalStorage
 from nexdr.agents.tool_types import create_success_tool_result, create_error_tool_result
 
 
+_ARXIV_API_URL = "https://export.arxiv.org/api/query"
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+
+_VALID_SORT_BY = {"submittedDate", "lastUpdatedDate", "relevance"}
+_VALID_SORT_ORDER = {"ascending", "descending"}
+
+# Shared session so repeated queries reuse the TCP+TLS connection
+_requests_session = requests.Session()
+
+# One session per event loop, shared by all concurrent arXiv fetches on that
+# loop. Sessions are loop-bound, and each tool call enters via asyncio.run
+# on a fresh loop, so a single module-wide session would die with the first
+_aiohttp_sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+async def _get_aiohttp_session() -> aiohttp.ClientSession:
+    """Lazily create the shared aiohttp session for the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _aiohttp_sessions.get(loop)
+    if session is None or session.closed:
+        # Sessions stranded on closed loops cannot be awaited closed
+        # anymore; dropping the references is all that is left to do
+        for stale in [l for l in _aiohttp_sessions if l.is_closed()]:
+            del _aiohttp_sessions[stale]
+        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30.0))
+        _aiohttp_sessions[loop] = session
+    return session
+
+
+def _build_query(keywords: str, categories: list[str] | None) -> str | None:
+    """Build the arXiv query string; returns None if no parameters are given"""
+    query_parts = []
+
+    # Add keyword queries
+    if keywords:
+        keyword_parts = []
+        for keyword in keywords.split(","):
+            keyword_parts.append(f'all:"{keyword}"')
+        query_parts.append(f"({' OR '.join(keyword_parts)})")
+
+    # Add category queries
+    if categories:
+        category_parts = []
+        for category in categories:
+            category_parts.append(f"cat:{category}")
+        query_parts.append(f"({' OR '.join(category_parts)})")
+
+    if not query_parts:
+        return None
+
+    # Combine the query parts with AND between keywords and categories
+    return " AND ".join(query_parts)
+
+
+def _parse_atom_entry(entry: ET.Element) -> dict:
+    """Extract the paper fields used by the tool from one Atom <entry>"""
+
+    def text(elem):
+        return elem.text.strip() if elem is not None and elem.text else None
+
+    summary = text(entry.find(f"{_ATOM_NS}summary")) or ""
+    entry_id = text(entry.find(f"{_ATOM_NS}id")) or ""
+    pdf_url = None
+    for link in entry.findall(f"{_ATOM_NS}link"):
+        if link.get("title") == "pdf":
+            pdf_url = link.get("href")
+            break
+    primary = entry.find(f"{_ARXIV_NS}primary_category")
+    return {
+        "title": text(entry.find(f"{_ATOM_NS}title")),
+        "authors": [
+            text(name)
+            for name in entry.findall(f"{_ATOM_NS}author/{_ATOM_NS}name")
+        ],
+        "snippet": summary[:200] + "..." if len(summary) > 200 else summary,
+        "published": text(entry.find(f"{_ATOM_NS}published")),
+        "updated": text(entry.find(f"{_ATOM_NS}updated")),
+        "arxiv_id": entry_id.split("/")[-1],
+        "link": pdf_url,
+        "categories": [
+            category.get("term")
+            for category in entry.findall(f"{_ATOM_NS}category")
+        ],
+        "primary_category": primary.get("term") if primary is not None else None,
+        "comment": text(entry.find(f"{_ARXIV_NS}comment")),
+        "journal_ref": text(entry.find(f"{_ARXIV_NS}journal_ref")),
+        "doi": text(entry.find(f"{_ARXIV_NS}doi")),
+    }
+
+
+async def _arxiv_query_async(
+    query: str, max_results: int, sort_by: str, sort_order: str
+) -> list[dict]:
+    """Fetch the Atom feed directly so many queries can run concurrently"""
+    session = await _get_aiohttp_session()
+    params = {
+        "search_query": query,
+        "start": 0,
+        "max_results": max_results,
+        "sortBy": sort_by,
+        "sortOrder": sort_order,
+    }
+    async with session.get(_ARXIV_API_URL, params=params) as response:
+        response.raise_for_status()
+        body = await response.read()
+
+    root = ET.fromstring(body)
+    return [_parse_atom_entry(entry) for entry in root.findall(f"{_ATOM_NS}entry")]
+
+
+@lru_cache(maxsize=256)
+def _arxiv_query(
+    query: str, max_results: int, sort_by: str, sort_order: str
+) -> tuple[dict, ...]:
+    """Run an arXiv query, memoized so repeated identical searches skip the network.
+
+    Streams the Atom feed through an incremental parser, emitting one dict
+    per entry without materializing the arxiv library's Result objects.
+    """
+    params = {
+        "search_query": query,
+        "start": 0,
+        "max_results": max_results,
+        "sortBy": sort_by if sort_by in _VALID_SORT_BY else "submittedDate",
+        "sortOrder": sort_order if sort_order in _VALID_SORT_ORDER else "descending",
+    }
+    response = _requests_session.get(
+        _ARXIV_API_URL, params=params, stream=True, timeout=30.0
+    )
+    response.raise_for_status()
+    response.raw.decode_content = True
+
+    papers = []
+    for _, elem in ET.iterparse(response.raw, events=("end",)):
+        if elem.tag == f"{_ATOM_NS}entry":
+            papers.append(_parse_atom_entry(elem))
+            elem.clear()
+    return tuple(papers)
+
+
 def arxiv_search_papers(
     keywords: Annotated[
         str, "The keywords to search for. Use comma to separate multiple keywords."
@@ -56,72 +202,44 @@ def arxiv_search_papers(
     """
     try:
         # Build the query string
-        query_parts = []
-
-        # Add keyword queries
-        if keywords:
-            keywords = keywords.split(",")
-            keyword_parts = []
-            for keyword in keywords:
-                keyword_parts.append(f'all:"{keyword}"')
-            query_parts.append(f"({' OR '.join(keyword_parts)})")
-
-        # Add category queries
-        if categories:
-            category_parts = []
-            for category in categories:
-                category_parts.append(f"cat:{category}")
-            query_parts.append(f"({' OR '.join(category_parts)})")
-
-        # Return an error if no query parameters are provided
-        if not query_parts:
+        query = _build_query(keywords, categories)
+        if query is None:
+            return "No keywords or categories provided"
+
+        # Copy the cached dicts: update_search_resources annotates them in place
+        papers = [
+            paper.copy() for paper in _arxiv_query(query, max_results, sort_by, sort_order)
+        ]
+        papers = update_search_resources(papers, global_storage)
+        data = {
+            "arxiv_search_papers_result": papers,
+        }
+        message = "Successfully searched arxiv papers"
+        tool_result = create_success_tool_result(data, message, "arxiv_search_papers")
+        return tool_result
+
+    except Exception as e:
+        error = f"Error occurred: {e} when searching arxiv papers"
+        message = "Failed to search arxiv papers"
+        tool_result = create_error_tool_result(error, message, "arxiv_search_papers")
+        return tool_result
+
+
+async def arxiv_search_papers_async(
+    keywords: str,
+    categories: list[str] | None = None,
+    max_results: int = 10,
+    sort_by: str = "submittedDate",
+    sort_order: str = "descending",
+    global_storage: GlobalStorage = None,
+) -> str:
+    """Async variant of arxiv_search_papers for concurrent batched searches."""
+    try:
+        query = _build_query(keywords, categories)
+        if query is None:
             return "No keywords or categories provided"
 
-        # Combine the query parts with AND between keywords and categories
-        query = " AND ".join(query_parts)
-
-        def search_arxiv():
-            search = arxiv.Search(
-                query=query,
-                max_results=max_results,
-                sort_by=getattr(
-                    arxiv.SortCriterion,
-                    sort_by,
-                    arxiv.SortCriterion.SubmittedDate,
-                ),
-                sort_order=getattr(
-                    arxiv.SortOrder,
-                    sort_order.title(),
-                    arxiv.SortOrder.Descending,
-                ),
-            )
-
-            papers = []
-            for result in search.results():
-                paper_info = {
-                    "title": result.title,
-                    "authors": [author.name for author in result.authors],
-                    "snippet": (
-                        result.summary[:200] + "..."
-                        if len(result.summary) > 200
-                        else result.summary
-                    ),
-                    "published": result.published.isoformat(),
-                    "updated": result.updated.isoformat() if result.updated else None,
-                    "arxiv_id": result.entry_id.split("/")[-1],
-                    "link": result.pdf_url,
-                    "categories": result.categories,
-                    "primary_category": result.primary_category,
-                    "comment": result.comment,
-                    "journal_ref": result.journal_ref,
-                    "doi": result.doi,
-                }
-                papers.append(paper_info)
-
-            return papers
-
-        # Execute the search asynchronously in the thread pool
-        papers = search_arxiv()
+        papers = await _arxiv_query_async(query, max_results, sort_by, sort_order)
         papers = update_search_resources(papers, global_storage)
         data = {
             "arxiv_search_papers_result": papers,
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from typing import Optional
-from nexdr.agents.deep_research.arxiv_search import arxiv_search_papers
+from nexdr.agents.deep_research.arxiv_search import (
+    arxiv_search_papers,
+    arxiv_search_papers_async,
+)
 from nexdr.agents.deep_research.web_search import web_search
 from nexau.archs.main_sub.agent_context import GlobalStorage
 from nexdr.agents.tool_types import create_error_tool_result
@@ -45,3 +49,42 @@ def search(
         message = "Failed to search"
         tool_result = create_error_tool_result(error, message, "search")
         return tool_result
+
+
+async def search_async(
+    query: str,
+    search_source: str = "web",
+    num_results: int = 10,
+    web_search_type: str = "search",
+    arxiv_categories: Optional[list[str]] = None,
+    arxiv_sort_by: Optional[str] = "submittedDate",
+    arxiv_sort_order: Optional[str] = "descending",
+    global_storage: Optional[GlobalStorage] = None,
+):
+    """Async variant of search so multiple queries can run concurrently."""
+    if search_source == "web":
+        # web_search drives its own event loop; run it off this one
+        return await asyncio.to_thread(
+            web_search, query, web_search_type, num_results, global_storage
+        )
+    elif search_source == "arxiv":
+        return await arxiv_search_papers_async(
+            query,
+            arxiv_categories,
+            num_results,
+            arxiv_sort_by,
+            arxiv_sort_order,
+            global_storage,
+        )
+    else:
+        error = f"Invalid search source: {search_source}"
+        message = "Failed to search"
+        tool_result = create_error_tool_result(error, message, "search")
+        return tool_result
+
+
+async def search_batch(queries: list[str], **kwargs):
+    """Run several searches concurrently; latency is ~one round trip, not N."""
+    return await asyncio.gather(
+        *[search_async(query, **kwargs) for query in queries]
+    )
@@ -13,15 +13,49 @@
 # limitations under the License.
 
 import asyncio
-import base64
 import io
 import os
+from dataclasses import dataclass
+
+try:
+    # SIMD-accelerated drop-in for stdlib base64 (libbase64 under the hood)
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    # Rust JSON parser; markedly faster than stdlib on large image payloads
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 from typing import Any
 
 import httpx
+from openai import AsyncOpenAI
 from PIL import Image
 
 
+# Metadata keys never surfaced to the agent; stripped before returning results
+_DROP_KEYS = frozenset(
+    {
+        "thumbnailUrl",
+        "thumbnailWidth",
+        "thumbnailHeight",
+        "imageWidth",
+        "imageHeight",
+        "googleUrl",
+    }
+)
+
+
+@dataclass(slots=True)
+class CaptionResult:
+    """Outcome of one captioning task; `text` is the caption or error message"""
+
+    ok: bool
+    text: str
+
+
 IMAGE_CAPTIONER_SYSTEM_PROMPT = """
 You are a helpful assistant that captions images.  
 Your task:  
@@ -36,33 +70,39 @@ Your response must follow this structure:
 """
 
 
-async def download_image_and_get_size(image_url: str) -> tuple[str, tuple[int, int]]:
-    """Download image from URL and return base64 data and original size"""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(image_url)
-        response.raise_for_status()
+def _image_size(image_bytes: bytes) -> tuple[int, int]:
+    """Read (width, height) from the image header; context-manage the handle"""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        return image.size
 
-        # Open image to get dimensions
-        image = Image.open(io.BytesIO(response.content))
-        original_size = image.size  # (width, height)
 
-        # Convert to base64
-        base64_data = base64.b64encode(response.content).decode("utf-8")
+async def download_image_and_get_size(
+    image_url: str, client: httpx.AsyncClient | None = None
+) -> tuple[bytes, tuple[int, int]]:
+    """Download image from URL and return the raw bytes and original size"""
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            return await download_image_and_get_size(image_url, own_client)
 
-        return base64_data, original_size
+    response = await client.get(image_url)
+    response.raise_for_status()
+
+    # PIL parsing is CPU work; keep it off the event loop thread
+    original_size = await asyncio.to_thread(_image_size, response.content)
+
+    return response.content, original_size
 
 
 def process_base64_image(base64_data: str) -> tuple[str, tuple[int, int]]:
     """Process base64 image data and return cleaned base64 and original size"""
     # Remove data URL prefix if present
     if base64_data.startswith("data:"):
-        # Extract base64 part after comma
-        base64_data = base64_data.split(",", 1)[1]
+        # Single slice past the comma; split would also allocate the prefix
+        base64_data = base64_data[base64_data.index(",") + 1 :]
 
-    # Decode to get image
+    # Decode to get image; size comes from the header parse alone
     image_bytes = base64.b64decode(base64_data)
-    image = Image.open(io.BytesIO(image_bytes))
-    original_size = image.size  # (width, height)
+    original_size = _image_size(image_bytes)
 
     return base64_data, original_size
 
@@ -71,17 +111,31 @@ async def async_image_captioner_with_base64(
     base64_data: str, mime_type: str = "image/jpeg"
 ) -> str:
     """Async image captioner that accepts base64 data"""
-    api_key = os.getenv("MULTI_MODAL_LLM_API_KEY")
-    base_url = os.getenv("MULTI_MODAL_LLM_BASE_URL")
-    model = os.getenv("MULTI_MODAL_LLM_MODEL")
+    # Create data URL for the API
+    data_url = f"data:{mime_type};base64,{base64_data}"
+    return await async_image_captioner_with_url(data_url)
 
-    # Use AsyncOpenAI for async operations
-    from openai import AsyncOpenAI
 
-    client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+# Built lazily and reused so caption calls share one connection pool
+_captioner_client: AsyncOpenAI | None = None
+_captioner_model: str | None = None
 
-    # Create data URL for the API
-    data_url = f"data:{mime_type};base64,{base64_data}"
+
+def _get_captioner_client() -> tuple[AsyncOpenAI, str | None]:
+    """Return the shared captioner client and model, building them on first use"""
+    global _captioner_client, _captioner_model
+    if _captioner_client is None:
+        _captioner_client = AsyncOpenAI(
+            api_key=os.getenv("MULTI_MODAL_LLM_API_KEY"),
+            base_url=os.getenv("MULTI_MODAL_LLM_BASE_URL"),
+        )
+        _captioner_model = os.getenv("MULTI_MODAL_LLM_MODEL")
+    return _captioner_client, _captioner_model
+
+
+async def async_image_captioner_with_url(data_url: str) -> str:
+    """Async image captioner that accepts any image URL (remote or data URL)"""
+    client, model = _get_captioner_client()
 
     response = await client.chat.completions.create(
         model=model,
@@ -107,6 +161,23 @@ class SerperSearch:
         self.base_url = "https://google.serper.dev/"
         self.timeout = timeout
         self.max_retries = max_retries
+        # One pooled client shared by retries and image downloads, so
+        # keep-alive connections survive between requests
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                connect=timeout,
+                read=timeout,
+                write=timeout,
+                pool=timeout,
+            ),
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=15.0,
+            ),
+        )
+        # Cap concurrent image fetch/caption work while overlapping all I/O
+        self._image_sem = asyncio.Semaphore(8)
         self.result_key_for_type: dict = {
             "news": "news",
             "places": "places",
@@ -114,6 +185,49 @@ class SerperSearch:
             "search": "organic",
         }
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "SerperSearch":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def _process_url_image(
+        self, url: str, idx: int, results: list
+    ) -> CaptionResult:
+        """Caption one URL-sourced image, downloading only as a fallback"""
+        try:
+            # Fast path: no download, no base64
+            return CaptionResult(True, await async_image_captioner_with_url(url))
+        except Exception:
+            pass
+        try:
+            raw_bytes, original_size = await download_image_and_get_size(
+                url, self._client
+            )
+            results[idx]["originalSize"] = {
+                "width": original_size[0],
+                "height": original_size[1],
+            }
+            base64_data = base64.b64encode(raw_bytes).decode("ascii")
+            return CaptionResult(
+                True, await async_image_captioner_with_base64(base64_data)
+            )
+        except Exception as e:
+            results[idx]["error"] = f"Failed to download/process image: {str(e)}"
+            return CaptionResult(False, f"Failed to process image: {str(e)}")
+
+    async def _caption_base64_image(self, base64_data: str) -> CaptionResult:
+        """Caption base64 image data, folding any failure into the result"""
+        try:
+            return CaptionResult(
+                True, await async_image_captioner_with_base64(base64_data)
+            )
+        except Exception as e:
+            return CaptionResult(False, f"Failed to generate caption: {str(e)}")
+
     async def search(
         self,
         query: str,
@@ -131,127 +245,93 @@ class SerperSearch:
 
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(
-                    timeout=httpx.Timeout(
-                        connect=self.timeout,
-                        read=self.timeout,
-                        write=self.timeout,
-                        pool=self.timeout,
-                    ),
-                ) as client:
-                    response = await client.post(
-                        self.base_url + search_type,
-                        headers=headers,
-                        json=payload,
-                    )
-                    response.raise_for_status()
-
-                    data = response.json()
-                    results = data.get(
-                        self.result_key_for_type[search_type],
-                        [],
-                    )
-                    results = results[:num_results]
-
-                    # Process image results to add captions and size info
-                    if search_type == "images":
-                        # Prepare tasks for parallel processing
-                        processing_tasks = []
-                        valid_image_indices = []
+                response = await self._client.post(
+                    self.base_url + search_type,
+                    headers=headers,
+                    json=payload,
+                )
+                response.raise_for_status()
 
+                data = _json_loads(response.content)
+                results = data.get(
+                    self.result_key_for_type[search_type],
+                    [],
+                )
+                results = results[:num_results]
+
+                # Process image results to add captions and size info
+                if search_type == "images":
+                    # Caption remote URLs directly; download only when the
+                    # endpoint can't fetch them
+                    async def process_url_image(url, idx):
+                        async with self._image_sem:
+                            return await self._process_url_image(url, idx, results)
+
+                    # One pass over the results: prune metadata keys and
+                    # schedule caption tasks as they are discovered. Tasks
+                    # never raise (they return CaptionResult), so the group
+                    # only propagates genuine cancellation
+                    image_tasks: list[tuple[int, asyncio.Task]] = []
+                    async with asyncio.TaskGroup() as tg:
                         for i, result in enumerate(results):
-                            if "imageUrl" in result:
-                                if result["imageUrl"].startswith("data:"):
-                                    # Process base64 image data
-                                    try:
-                                        base64_data, original_size = (
-                                            process_base64_image(result["imageUrl"])
-                                        )
-                                        result["originalSize"] = {
-                                            "width": original_size[0],
-                                            "height": original_size[1],
-                                        }
-
-                                        # Add caption generation task for base64 data
-                                        processing_tasks.append(
-                                            async_image_captioner_with_base64(
-                                                base64_data
-                                            )
+                            for key in _DROP_KEYS.intersection(result):
+                                del result[key]
+                            if "imageUrl" not in result:
+                                continue
+                            if result["imageUrl"].startswith("data:"):
+                                # Decode + header parse are CPU-bound and can
+                                # be MBs; run them in a worker thread so the
+                                # event loop keeps servicing other searches
+                                try:
+                                    base64_data, original_size = (
+                                        await asyncio.to_thread(
+                                            process_base64_image,
+                                            result["imageUrl"],
                                         )
-                                        valid_image_indices.append(i)
-                                        # Remove the original imageUrl to save space
-                                        del result["imageUrl"]
-                                    except Exception as e:
-                                        result["error"] = (
-                                            f"Failed to process base64 image: {str(e)}"
-                                        )
-                                        del result["imageUrl"]
-                                else:
-                                    # Download image and get size info
-                                    async def process_url_image(url, idx):
-                                        try:
-                                            (
-                                                base64_data,
-                                                original_size,
-                                            ) = await download_image_and_get_size(url)
-                                            results[idx]["originalSize"] = {
-                                                "width": original_size[0],
-                                                "height": original_size[1],
-                                            }
-                                            return (
-                                                await async_image_captioner_with_base64(
+                                    )
+                                    result["originalSize"] = {
+                                        "width": original_size[0],
+                                        "height": original_size[1],
+                                    }
+                                    image_tasks.append(
+                                        (
+                                            i,
+                                            tg.create_task(
+                                                self._caption_base64_image(
                                                     base64_data
                                                 )
-                                            )
-                                        except Exception as e:
-                                            results[idx]["error"] = (
-                                                f"Failed to download/process image: {str(e)}"
-                                            )
-                                            return f"Failed to process image: {str(e)}"
-
-                                    processing_tasks.append(
-                                        process_url_image(result["imageUrl"], i)
-                                    )
-                                    valid_image_indices.append(i)
-
-                        # Execute all processing tasks in parallel
-                        if processing_tasks:
-                            try:
-                                captions = await asyncio.gather(
-                                    *processing_tasks, return_exceptions=True
-                                )
-
-                                # Assign captions back to results
-                                for idx, caption in zip(valid_image_indices, captions):
-                                    if isinstance(caption, Exception):
-                                        results[idx]["caption"] = (
-                                            f"Failed to generate caption: {str(caption)}"
+                                            ),
                                         )
-                                    else:
-                                        results[idx]["caption"] = caption
-                            except Exception as e:
-                                # Fallback: if parallel processing fails entirely
-                                for idx in valid_image_indices:
-                                    results[idx]["caption"] = (
-                                        f"Parallel processing failed: {str(e)}"
                                     )
-                    else:
-                        # For non-image searches, handle base64 images as before
-                        for result in results:
-                            if "imageUrl" in result and result["imageUrl"].startswith(
-                                "data:",
-                            ):
-                                # delete base64 image url
+                                except Exception as e:
+                                    result["error"] = (
+                                        f"Failed to process base64 image: {str(e)}"
+                                    )
+                                # Remove the original imageUrl to save space
                                 del result["imageUrl"]
+                            else:
+                                image_tasks.append(
+                                    (
+                                        i,
+                                        tg.create_task(
+                                            process_url_image(result["imageUrl"], i)
+                                        ),
+                                    )
+                                )
+
+                    for idx, task in image_tasks:
+                        results[idx]["caption"] = task.result().text
+                else:
+                    # For non-image searches, prune in the same single pass
                     for result in results:
-                        result.pop("thumbnailUrl", None)
-                        result.pop("thumbnailWidth", None)
-                        result.pop("thumbnailHeight", None)
-                        result.pop("imageWidth", None)
-                        result.pop("imageHeight", None)
-                        result.pop("googleUrl", None)
-                        result.pop("googleUrl", None)
-                    return results
+                        for key in _DROP_KEYS.intersection(result):
+                            del result[key]
+                        if "imageUrl" in result and result["imageUrl"].startswith(
+                            "data:",
+                        ):
+                            # delete base64 image url
+                            del result["imageUrl"]
+                return results
 
             except httpx.ConnectTimeout as e:
                 if attempt == self.max_retries - 1:
@@ -283,29 +363,31 @@ class SerperSearch:
 
 
 def search_images(query: str) -> list[dict[str, Any]]:
-    searcher = SerperSearch()
-    return asyncio.run(searcher.search(query, "images", 5))
+    async def _run():
+        async with SerperSearch() as searcher:
+            return await searcher.search(query, "images", 5)
+
+    return asyncio.run(_run())
 
 
 if __name__ == "__main__":
     import time
     import json
 
-    searcher = SerperSearch()
-
     async def main():
-        # Test regular search
-        print("Testing regular search:")
-        results = await searcher.search(
-            "Tencent game self-developed capabilities", "search", 5
-        )
-        print(f"Found {len(results)} results")
-
-        # Test image search with parallel caption generation
-        print("\nTesting image search with parallel captions:")
-        start_time = time.time()
-        image_results = await searcher.search("cute cats", "images", 5)
-        end_time = time.time()
+        async with SerperSearch() as searcher:
+            # Test regular search
+            print("Testing regular search:")
+            results = await searcher.search(
+                "Tencent game self-developed capabilities", "search", 5
+            )
+            print(f"Found {len(results)} results")
+
+            # Test image search with parallel caption generation
+            print("\nTesting image search with parallel captions:")
+            start_time = time.time()
+            image_results = await searcher.search("cute cats", "images", 5)
+            end_time = time.time()
 
         print(f"Found {len(image_results)} image results")
         print(f"Parallel caption generation took: {end_time - start_time:.2f} seconds")
@@ -22,45 +22,54 @@ def update_search_resources(
     """Update search resources with thread-safe operations using shared state."""
     with global_storage.lock_key("resources"):
         resources = global_storage.get("resources", {})
+        # Flat url -> id index: readers needing only IDs can fetch this small
+        # dict instead of scanning the full resources payload
+        url_to_id = global_storage.get("url_to_id", None)
+        if url_to_id is None:
+            url_to_id = {url: info["id"] for url, info in resources.items()}
+        # Running counter: O(1) allocation instead of scanning all resources
+        next_id = global_storage.get("next_resource_id", None)
+        if next_id is None:
+            next_id = max(url_to_id.values()) + 1 if url_to_id else 1
         for result in results:
             url = result.get("link", None)
             snippet = result.get("snippet", None)
             if not url:
                 continue
-            if url in resources.keys():
+            result_info = resources.get(url)
+            if result_info is not None:
                 # URL already exists, use existing ID
-                result["id"] = resources[url]["id"]
-                result_info = resources[url]
+                result["id"] = result_info["id"]
                 if "snippet_id2content" not in result_info:
                     result_info["snippet_id2content"] = {}
                 if "snippet_content2id" not in result_info:
                     result_info["snippet_content2id"] = {}
             else:
                 # Generate new global ID for this URL atomically
-                new_id = (
-                    max(resources.values(), key=lambda x: x["id"])["id"] + 1
-                    if resources
-                    else 1
-                )
+                new_id = next_id
+                next_id += 1
                 result["id"] = new_id
                 result_info = result.copy()
                 result_info["id"] = new_id
                 result_info["snippet_id2content"] = {}
                 result_info["snippet_content2id"] = {}
+                url_to_id[url] = new_id
 
             # Handle snippet
             if snippet:
-                if snippet in result_info["snippet_content2id"].keys():
-                    snippet_id = result_info["snippet_content2id"][snippet]
-                else:
-                    snippet_id = (
-                        max(
-                            result_info["snippet_content2id"].values(),
+                snippet_id = result_info["snippet_content2id"].get(snippet)
+                if snippet_id is None:
+                    snippet_id = result_info.get("next_snippet_id")
+                    if snippet_id is None:
+                        snippet_id = (
+                            max(
+                                result_info["snippet_content2id"].values(),
+                            )
+                            + 1
+                            if result_info["snippet_content2id"]
+                            else 1
                         )
-                        + 1
-                        if result_info["snippet_content2id"]
-                        else 1
-                    )
+                    result_info["next_snippet_id"] = snippet_id + 1
                     result_info["snippet_content2id"][snippet] = snippet_id
                     result_info["snippet_id2content"][snippet_id] = snippet
                 result["snippet_id"] = snippet_id
@@ -69,5 +78,7 @@ def update_search_resources(
             resources[url] = result_info
         # Update resources in shared state atomically
         global_storage.set("resources", resources)
+        global_storage.set("url_to_id", url_to_id)
+        global_storage.set("next_resource_id", next_id)
 
     return results
@@ -25,14 +25,15 @@ def web_search(
     num_results: int = 10,
     global_storage: GlobalStorage = None,
 ):
-    serper_search = SerperSearch()
-    results = asyncio.run(
-        serper_search.search(
-            query,
-            search_type,
-            num_results,
-        ),
-    )
+    async def _run():
+        async with SerperSearch() as serper_search:
+            return await serper_search.search(
+                query,
+                search_type,
+                num_results,
+            )
+
+    results = asyncio.run(_run())
     if isinstance(results, list):
         results = update_search_resources(results, global_storage)
         data = {
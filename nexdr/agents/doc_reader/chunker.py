@@ -12,8 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import os
+import re
+from itertools import islice
+
 import tiktoken
 
+# Paragraph boundary: one blank line or more
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\n+")
+
+# Paragraphs are tokenized and chunked in blocks of this size, bounding peak
+# memory on MB-scale documents while keeping batch encoding effective
+_PARAGRAPH_BLOCK = 512
+
+
+def _iter_paragraphs(text: str):
+    """Yield stripped, non-empty paragraphs without materializing them all."""
+    start = 0
+    for match in _PARAGRAPH_BREAK_RE.finditer(text):
+        para = text[start : match.start()].strip()
+        if para:
+            yield para
+        start = match.end()
+    para = text[start:].strip()
+    if para:
+        yield para
+
 
 class MarkdownChunker:
     def __init__(self, chunk_size: int = 500, overlap_size: int = 0, tokenizer=None):
@@ -23,6 +48,9 @@ class MarkdownChunker:
             self.tokenizer = tiktoken.encoding_for_model("gpt-4o")
         else:
             self.tokenizer = tokenizer
+        # Word- and line-level splitting re-encodes the same short strings
+        # many times; a per-instance cache makes those hits O(1)
+        self.count_tokens = functools.lru_cache(maxsize=200_000)(self.count_tokens)
 
     def count_tokens(self, text: str) -> int:
         return len(self.tokenizer.encode(text, disallowed_special=()))
@@ -33,6 +61,15 @@ class MarkdownChunker:
     def detokenize(self, token_ids: list[int]) -> str:
         return self.tokenizer.decode(token_ids)
 
+    def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        """Tokenize many strings in one call; BPE runs in parallel Rust threads"""
+        return [
+            len(ids)
+            for ids in self.tokenizer.encode_ordinary_batch(
+                texts, num_threads=os.cpu_count()
+            )
+        ]
+
     def _split_long_paragraph(self, paragraph: str) -> list[str]:
         """Split a long paragraph into smaller chunks at spaces or newlines."""
         if self.count_tokens(paragraph) <= self.chunk_size:
@@ -41,13 +78,12 @@ class MarkdownChunker:
         # Try to split at newlines first
         if "\n" in paragraph:
             lines = paragraph.split("\n")
+            line_token_counts = self.count_tokens_batch(lines)
             chunks = []
             current_chunk: list[str] = []
             current_tokens = 0
 
-            for line in lines:
-                line_tokens = self.count_tokens(line)
-
+            for line, line_tokens in zip(lines, line_token_counts):
                 # If adding this line would exceed chunk size
                 if current_tokens + line_tokens > self.chunk_size and current_chunk:
                     chunk_text = "\n".join(current_chunk)
@@ -68,13 +104,13 @@ class MarkdownChunker:
         # If no newlines, try to split at spaces
         if " " in paragraph:
             words = paragraph.split(" ")
+            # Include the trailing space in each word's token count
+            word_token_counts = self.count_tokens_batch([word + " " for word in words])
             chunks = []
             current_chunk = []
             current_tokens = 0
 
-            for word in words:
-                word_tokens = self.count_tokens(word + " ")  # Include space
-
+            for word, word_tokens in zip(words, word_token_counts):
                 # If adding this word would exceed chunk size
                 if current_tokens + word_tokens > self.chunk_size and current_chunk:
                     chunk_text = " ".join(current_chunk)
@@ -92,76 +128,97 @@ class MarkdownChunker:
 
             return chunks
 
-        # If no spaces or newlines, split by character count
-        # Use chunk_size as character size for simplicity and speed
-        chunks = []
-        for i in range(0, len(paragraph), self.chunk_size):
-            chunk = paragraph[i : i + self.chunk_size]
-            if chunk:  # Only add non-empty chunks
-                chunks.append(chunk)
+        # If no spaces or newlines, split on token boundaries: chunk_size is
+        # a token budget, so slicing the token ids gives correctly-sized
+        # chunks from a single encode
+        token_ids = self.tokenize(paragraph)
+        return [
+            self.detokenize(token_ids[i : i + self.chunk_size])
+            for i in range(0, len(token_ids), self.chunk_size)
+        ]
 
+    def split_text(self, markdown_text: str) -> list[str]:
+        chunks, _ = self.split_text_with_token_count(markdown_text)
         return chunks
 
-    def split_text(self, markdown_text: str) -> list[str]:
-        # Split text into paragraphs
-        paragraphs = [p.strip() for p in markdown_text.split("\n\n") if p.strip()]
+    def split_text_with_token_count(self, markdown_text: str) -> tuple[list[str], int]:
+        """Split the text and also return its total token count.
+
+        The count falls out of the per-chunk bookkeeping, so callers that
+        need both avoid tokenizing the whole document a second time.
+        """
+        # Stream paragraphs in blocks: each block is batch-tokenized, but the
+        # full paragraph list is never materialized at once
+        paragraphs = _iter_paragraphs(markdown_text)
 
         chunks: list[dict[str, object]] = []
         current_chunk: list[str] = []
+        # Token count per paragraph in current_chunk, kept in lockstep so the
+        # overlap pass reuses counts instead of re-tokenizing each paragraph
+        current_counts: list[int] = []
         current_tokens = 0
 
-        for para in paragraphs:
-            para_tokens = self.count_tokens(para)
-
-            # If paragraph is too long, split it first
-            if para_tokens > self.chunk_size:
-                # If we have a current chunk, save it first
-                if current_chunk:
+        while True:
+            block = list(islice(paragraphs, _PARAGRAPH_BLOCK))
+            if not block:
+                break
+            for para, para_tokens in zip(block, self.count_tokens_batch(block)):
+                # If paragraph is too long, split it first
+                if para_tokens > self.chunk_size:
+                    # If we have a current chunk, save it first
+                    if current_chunk:
+                        chunk_text = "\n\n".join(current_chunk)
+                        chunks.append(
+                            {"content": chunk_text, "token_count": current_tokens},
+                        )
+                        current_chunk = []
+                        current_counts = []
+                        current_tokens = 0
+
+                    # Split the long paragraph; one batch count for the pieces
+                    para_chunks = self._split_long_paragraph(para)
+                    for para_chunk, para_chunk_tokens in zip(
+                        para_chunks, self.count_tokens_batch(para_chunks)
+                    ):
+                        chunks.append(
+                            {"content": para_chunk, "token_count": para_chunk_tokens},
+                        )
+                    continue
+
+                # If adding this paragraph would exceed chunk size
+                if current_tokens + para_tokens > self.chunk_size and current_chunk:
+                    # Create a chunk from current paragraphs
                     chunk_text = "\n\n".join(current_chunk)
                     chunks.append(
                         {"content": chunk_text, "token_count": current_tokens},
                     )
-                    current_chunk = []
-                    current_tokens = 0
-
-                # Split the long paragraph
-                para_chunks = self._split_long_paragraph(para)
-                for para_chunk in para_chunks:
-                    para_chunk_tokens = self.count_tokens(para_chunk)
-                    chunks.append(
-                        {"content": para_chunk, "token_count": para_chunk_tokens},
-                    )
-                continue
-
-            # If adding this paragraph would exceed chunk size
-            if current_tokens + para_tokens > self.chunk_size and current_chunk:
-                # Create a chunk from current paragraphs
-                chunk_text = "\n\n".join(current_chunk)
-                chunks.append(
-                    {"content": chunk_text, "token_count": current_tokens},
-                )
-
-                # Handle overlap
-                if self.overlap_size > 0:
-                    # Keep complete paragraphs for overlap
-                    overlap_paras: list[str] = []
-                    overlap_tokens = 0
-                    for p in reversed(current_chunk):
-                        p_tokens = self.count_tokens(p)
-                        if overlap_tokens + p_tokens <= self.overlap_size:
-                            overlap_paras.insert(0, p)
-                            overlap_tokens += p_tokens
-                        else:
-                            break
-                    current_chunk = overlap_paras
-                    current_tokens = overlap_tokens
-                else:
-                    current_chunk = []
-                    current_tokens = 0
 
-            # Add paragraph to current chunk
-            current_chunk.append(para)
-            current_tokens += para_tokens
+                    # Handle overlap
+                    if self.overlap_size > 0:
+                        # Walk the stored counts backwards to find how many
+                        # tail paragraphs fit, then keep them with one slice
+                        # instead of repeated insert(0, ...) calls
+                        cut = len(current_chunk)
+                        overlap_tokens = 0
+                        while (
+                            cut > 0
+                            and overlap_tokens + current_counts[cut - 1]
+                            <= self.overlap_size
+                        ):
+                            cut -= 1
+                            overlap_tokens += current_counts[cut]
+                        current_chunk = current_chunk[cut:]
+                        current_counts = current_counts[cut:]
+                        current_tokens = overlap_tokens
+                    else:
+                        current_chunk = []
+                        current_counts = []
+                        current_tokens = 0
+
+                # Add paragraph to current chunk
+                current_chunk.append(para)
+                current_counts.append(para_tokens)
+                current_tokens += para_tokens
 
         # Add the last chunk if there's anything left
         if current_chunk:
@@ -169,8 +226,9 @@ class MarkdownChunker:
             chunks.append(
                 {"content": chunk_text, "token_count": current_tokens},
             )
+        total_tokens = sum(int(chunk["token_count"]) for chunk in chunks)
         chunks_content = [str(chunk["content"]).strip() for chunk in chunks]
-        return chunks_content
+        return chunks_content, total_tokens
 
 
 def split_text_into_chunks(
@@ -178,3 +236,10 @@ def split_text_into_chunks(
 ) -> list[str]:
     chunker = MarkdownChunker(chunk_size=chunk_size, overlap_size=overlap_size)
     return chunker.split_text(text)
+
+
+def split_text_into_chunks_with_token_count(
+    text: str, chunk_size: int = 500, overlap_size: int = 0
+) -> tuple[list[str], int]:
+    chunker = MarkdownChunker(chunk_size=chunk_size, overlap_size=overlap_size)
+    return chunker.split_text_with_token_count(text)
@@ -12,63 +12,104 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import asyncio
+import functools
 import logging
 import os
+import re
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import tiktoken
 
 from nexdr.agents.tool_types import create_error_tool_result
 from nexdr.agents.tool_types import create_success_tool_result
-from nexdr.agents.doc_reader.chunker import split_text_into_chunks
+from nexdr.agents.doc_reader.chunker import split_text_into_chunks_with_token_count
+from nexdr.agents.doc_reader.retrieval import word_tokenize
 from nexau.archs.main_sub.agent_context import GlobalStorage
-from nexdr.agents.doc_reader.file_parser import FileParser
+from nexdr.agents.doc_reader.file_parser import get_default_parser
 
 
 logger = logging.getLogger(__name__)
 
+# Non-empty paragraph blocks within a chunk, matched in one C-level sweep.
+# Each match starts at the first non-space character and the lookahead stops
+# it before trailing whitespace, so matches come out already trimmed
+_PARAGRAPH_BLOCK_RE = re.compile(r"(?s)\S.*?(?=\s*(?:\n\n|\Z))")
+
+# Markdown heading lines; bounded so a runaway line can't blow up the match
+_HEADING_RE = re.compile(r"^#[^\n]{0,200}", re.MULTILINE)
+
+# Temp-file saves run here so preprocessing overlaps the disk write; each
+# submission is reaped before its function returns
+_write_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="doc-write")
+
+
+def _write_doc_bytes(filepath: str, payload: bytes) -> None:
+    # One binary write of pre-encoded bytes; skips the text-mode
+    # encode/buffer/flush machinery for multi-MB documents
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+
 
 def is_url(url_or_local_file: str) -> bool:
-    return url_or_local_file.startswith("http")
+    return url_or_local_file.startswith(("http://", "https://"))
+
+
+@functools.lru_cache(maxsize=4)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    # encoding_for_model rebuilds the BPE merge tables every call; cache the
+    # Encoding (thread-safe for encode) so only the first call pays that cost
+    return tiktoken.encoding_for_model(model)
 
 
 def count_tokens(text: str) -> int:
-    encoding = tiktoken.encoding_for_model("gpt-4o")
-    return len(encoding.encode(text, disallowed_special=()))
+    """Count tokens by batch-encoding paragraph segments in parallel.
+
+    A single encode call holds the GIL for the whole document;
+    encode_ordinary_batch runs the BPE across tiktoken's Rust thread pool.
+    The separators are kept on each segment so the sum stays faithful.
+    """
+    segments = text.split("\n\n")
+    batch = [segment + "\n\n" for segment in segments[:-1]]
+    batch.append(segments[-1])
+    return sum(
+        len(ids)
+        for ids in _get_encoding("gpt-4o").encode_ordinary_batch(
+            batch, num_threads=os.cpu_count()
+        )
+    )
 
 
 def add_line_id_for_doc_content(
     doc_id: str, doc_chunks: list[str]
 ) -> tuple[list[str], dict[int, str]]:
     lines_id_2_content = {}
-    start_line_id = 1
+    line_id = 1
     new_doc_chunks = []
-    for i, chunk in enumerate(doc_chunks):
-        lines = chunk.split("\n\n")
-        lines = [line.strip() for line in lines if line.strip()]
-        lines_id_2_content.update(
-            {start_line_id + j: line for j, line in enumerate(lines)},
-        )
-        new_doc_chunks.append(
-            "\n\n".join(
-                [
-                    f"【{doc_id}†L{start_line_id + j}】: {line}"
-                    for j, line in enumerate(lines)
-                ],
-            ),
-        )
-        start_line_id += len(lines)
+    # doc_id is interpolated once into the template; the loop then runs a
+    # single %-format per line instead of a three-part f-string
+    line_tpl = f"【{doc_id}†L%d】: %s"
+    for chunk in doc_chunks:
+        parts = []
+        append = parts.append
+        for m in _PARAGRAPH_BLOCK_RE.finditer(chunk):
+            line = m.group(0)
+            lines_id_2_content[line_id] = line
+            append(line_tpl % (line_id, line))
+            line_id += 1
+        new_doc_chunks.append("\n\n".join(parts))
     return new_doc_chunks, lines_id_2_content
 
 
 def extract_headings(chunk: str) -> list[str]:
-    headings = []
-    for line in chunk.split("\n\n"):
-        if line.startswith("#"):
-            headings.append(line[:100] + "..." if len(line) > 100 else line)
-    return headings
+    return [
+        line[:100] + "..." if len(line) > 100 else line
+        for line in _HEADING_RE.findall(chunk)
+    ]
 
 
 def extract_chunks_table_of_contents(doc_id: str, chunks: list[str]) -> dict[str, str]:
@@ -81,14 +122,19 @@ def extract_chunks_table_of_contents(doc_id: str, chunks: list[str]) -> dict[str
 
 def doc_preprocess(input: str, global_storage: GlobalStorage):
     workspace = global_storage.get("workspace", None)
-    resources = global_storage.get("resources", {})
-    if input.startswith("http") or os.path.exists(input):
+    if is_url(input) or os.path.exists(input):
         url_or_local_file = input
     elif workspace and os.path.exists(os.path.join(workspace, input)):
         url_or_local_file = os.path.join(workspace, input)
     elif input.isdigit():
         input = int(input)
-        id2url = {item["id"]: item["link"] for item in resources.values()}
+        # The small url_to_id index resolves IDs without pulling the full
+        # resources payload; fall back to a scan if it was never built
+        url_to_id = global_storage.get("url_to_id", None)
+        if url_to_id is None:
+            resources = global_storage.get("resources", {})
+            url_to_id = {item["link"]: item["id"] for item in resources.values()}
+        id2url = {doc_id: url for url, doc_id in url_to_id.items()}
         if input not in id2url:
             error = f"Invalid document id: {input}"
             message = "Failed to preprocess document, invalid document id"
@@ -148,43 +194,60 @@ def doc_preprocess_function(
                 success = return_dict["status"] == "success"
                 return success, return_dict
         else:
-            max_id = (
-                max(resources.values(), key=lambda x: x["id"])["id"] if resources else 0
-            )
-            doc_id = max_id + 1
+            # Documents share the resource ID space, so allocate from the
+            # same running counter instead of scanning every resource
+            next_id = global_storage.get("next_resource_id", None)
+            if next_id is None:
+                next_id = (
+                    max(info["id"] for info in resources.values()) + 1
+                    if resources
+                    else 1
+                )
+            doc_id = next_id
             resources[url_or_local_file] = {
                 "id": doc_id,
                 "link": url_or_local_file,
             }
-        # Update resources in shared state atomically
-        global_storage.set("resources", resources)
+            global_storage.set("next_resource_id", doc_id + 1)
+            url_to_id = global_storage.get("url_to_id", None)
+            if url_to_id is not None:
+                url_to_id[url_or_local_file] = doc_id
+                global_storage.set("url_to_id", url_to_id)
+            # Only a new entry dirties resources; the cache-hit path above
+            # returns (or falls through) without a write-back
+            global_storage.set("resources", resources)
 
-    file_parser = FileParser()
-    success, doc_content, return_suffix = asyncio.run(
-        file_parser.parse(url_or_local_file),
-    )
-    token_count = count_tokens(doc_content)
+    file_parser = get_default_parser()
+    # One blocking fetch; spinning up an event loop for it buys nothing
+    success, doc_content, return_suffix = file_parser.parse_sync(url_or_local_file)
     agentic_doc_read_token_limit = global_storage.get(
         "agentic_doc_read_token_limit",
         21000,
     )
+    chunk_size = global_storage.get("doc_chunk_size", 2100)
+    logger.info(
+        f"read token limit: {agentic_doc_read_token_limit}, chunk size: {chunk_size}",
+    )
+    # The token count falls out of chunking, so the document is tokenized
+    # once instead of a separate whole-document encode up front
+    chunks, token_count = split_text_into_chunks_with_token_count(
+        doc_content,
+        chunk_size,
+    )
     return_dict = {
         "doc_id": doc_id,
         "link": url_or_local_file,
         "status": "success" if success else "failed",
         "token_count": token_count,
     }
-    chunk_size = global_storage.get("doc_chunk_size", 2100)
-    logger.info(
-        f"read token limit: {agentic_doc_read_token_limit}, chunk size: {chunk_size}",
-    )
-    chunks = split_text_into_chunks(doc_content, chunk_size)
     chunk_table_of_contents = extract_chunks_table_of_contents(doc_id, chunks)
     chunks, doc_lines_id_2_content = add_line_id_for_doc_content(
         doc_id,
         chunks,
     )
-    document_content_with_line_id = "\n\n".join(chunks)
+    # Only materialize the monolithic annotated text when the whole document
+    # is returned; for long documents the chunks list is the source of truth
+    document_content_with_line_id = None
     chunk_count = len(chunks)
     if token_count > agentic_doc_read_token_limit:
         return_dict["system_remainder"] = (
@@ -196,16 +259,23 @@ def doc_preprocess_function(
         return_dict["chunk_1_content"] = chunks[1]
         return_dict["chunk_2_content"] = chunks[2]
     else:
+        document_content_with_line_id = "\n\n".join(chunks)
         chunks = [document_content_with_line_id]
         return_dict["document_content"] = document_content_with_line_id
         return_dict["system_remainder"] = (
             f"The document 【{doc_id}】({url_or_local_file}) is short, return the entire content."
         )
+    write_future = None
     if success:
         temp_dir = global_storage.get("temp_dir", tempfile.mkdtemp())
         filepath = os.path.join(temp_dir, f"{doc_id}{return_suffix}")
-        with open(filepath, "w") as f:
-            f.write(doc_content)
+        # Submit the write and keep building the document record while the
+        # disk I/O proceeds in the background
+        write_future = _write_executor.submit(
+            _write_doc_bytes,
+            filepath,
+            doc_content.encode("utf-8"),
+        )
         return_dict["system_remainder"] += (
             f"The document 【{doc_id}】({url_or_local_file}) is saved to {filepath}"
         )
@@ -216,6 +286,8 @@ def doc_preprocess_function(
         "content": document_content_with_line_id,
         "token_count": token_count,
         "chunks": chunks,
+        # Tokenized once here so BM25 retrieval never re-segments per query
+        "chunks_tokens": [word_tokenize(chunk.lower()) for chunk in chunks],
         "chunk_count": chunk_count,
         "line_id_2_content": doc_lines_id_2_content,
         "timestamp": datetime.now().isoformat(),
@@ -230,4 +302,7 @@ def doc_preprocess_function(
         resources[url_or_local_file].update(document_info_dict)
         # Update resources in shared state atomically
         global_storage.set("resources", resources)
+    if write_future is not None:
+        # Reap the overlapped write; surfaces any disk error before returning
+        write_future.result()
     return success, return_dict
@@ -13,19 +13,19 @@
 # limitations under the License.
 
 from nexau.archs.main_sub.agent_context import GlobalStorage
+from nexdr.agents.doc_reader.resource_index import doc_id_to_url
 from nexdr.agents.tool_types import create_success_tool_result, create_error_tool_result
 
 
 def doc_reader(doc_id: int, chunk_id: int, global_storage: GlobalStorage):
-    resources = global_storage.get("resources", {})
-    doc_id2url = {item["id"]: item["link"] for item in resources.values()}
-    if doc_id not in doc_id2url:
+    url = doc_id_to_url(doc_id, global_storage)
+    if url is None:
         error = f"Document {doc_id} not found"
         message = "Failed to read document"
         tool_result = create_error_tool_result(error, message, "doc_reader")
         return tool_result
-    url = doc_id2url[doc_id]
-    chunks = resources[url].get("chunks", [])
+    resources = global_storage.get("resources", {})
+    chunks = resources.get(url, {}).get("chunks", [])
     if len(chunks) == 0:
         error = f"Document {doc_id} has no available document chunks"
         message = "Failed to read document"
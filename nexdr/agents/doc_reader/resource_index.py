@@ -0,0 +1,38 @@
+# Copyright (c) Nex-AGI. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nexau.archs.main_sub.agent_context import GlobalStorage
+
+# Reverse (id -> url) maps cached per storage identity and index size: IDs
+# are append-only within one storage, so an unchanged length means an
+# unchanged mapping, and keying on the storage keeps instances that happen
+# to hold equal-sized indexes from sharing an entry
+_id2url_caches: dict[int, tuple[int, dict]] = {}
+
+
+def doc_id_to_url(doc_id: int, global_storage: GlobalStorage) -> str | None:
+    """Resolve a document id to its URL without scanning all resources."""
+    url_to_id = global_storage.get("url_to_id", None)
+    if url_to_id is None:
+        # Index not built yet; fall back to one scan of the full payload
+        resources = global_storage.get("resources", {})
+        url_to_id = {item["link"]: item["id"] for item in resources.values()}
+    cache_key = id(global_storage)
+    cached = _id2url_caches.get(cache_key)
+    if cached is not None and cached[0] == len(url_to_id):
+        id2url = cached[1]
+    else:
+        id2url = {item_id: url for url, item_id in url_to_id.items()}
+        _id2url_caches[cache_key] = (len(url_to_id), id2url)
+    return id2url.get(doc_id)
@@ -13,10 +13,14 @@
 # limitations under the License.
 
 import logging
+import logging.handlers
 import os
+import queue
 import re
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from nexau.archs.main_sub.execution.hooks import (
     Middleware,
     HookResult,
@@ -32,6 +36,71 @@ from nexau.archs.main_sub.utils.token_counter import TokenCounter
 
 logger = logging.getLogger(__name__)
 
+# Character budget for the history serialized into judge/validator prompts
+# (~100k tokens at >= 3 chars per token). Content past this would only be
+# truncated downstream, so building it wastes allocation and copy time
+_HISTORY_CHAR_BUDGET = 300_000
+
+# Judge/validator response tags are parsed on every hook invocation; compiling
+# the patterns once avoids the per-call re-cache lookup and flag parsing
+_JUDGE_RESULT_RE = re.compile(
+    r"<judge_result[^>]*>\s*(true|false|yes|no|1|0)\s*</judge_result>",
+    re.IGNORECASE | re.DOTALL,
+)
+_JUDGE_REASON_RE = re.compile(
+    r"<judge_reason[^>]*>\s*(.*?)\s*</judge_reason>",
+    re.IGNORECASE | re.DOTALL,
+)
+# All three validation_* tags are pulled out in one scan instead of three
+# separate passes over what can be a long response
+_VALIDATOR_RE = re.compile(
+    r"<validation_(?P<tag>result|reason|suggestion)[^>]*>"
+    r"\s*(?P<val>.*?)\s*</validation_(?P=tag)>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+class _DropOnFullQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when full."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped_count = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # A stalled drain thread must not stall the agent thread;
+            # count the loss instead of blocking
+            self.dropped_count += 1
+
+
+def _start_queue_logging(
+    log: logging.Logger | None,
+) -> logging.handlers.QueueListener | None:
+    """Move a logger's handler I/O onto a background drain thread.
+
+    The logger's handlers are replaced with a bounded queue handler and a
+    QueueListener drains the queue into the original handlers, so the agent
+    thread only enqueues records. Loggers without handlers (or with a queue
+    handler already configured by the caller) are left untouched.
+    """
+    if log is None or not log.handlers:
+        return None
+    if any(
+        isinstance(handler, logging.handlers.QueueHandler)
+        for handler in log.handlers
+    ):
+        return None
+    log_queue: queue.Queue = queue.Queue(maxsize=10_000)
+    listener = logging.handlers.QueueListener(
+        log_queue, *log.handlers, respect_handler_level=True
+    )
+    log.handlers = [_DropOnFullQueueHandler(log_queue)]
+    listener.start()
+    return listener
+
 
 class LoggingMiddleware(Middleware):
     """Middleware that logs after-model and/or after-tool phases."""
@@ -50,6 +119,19 @@ class LoggingMiddleware(Middleware):
         self.message_preview_chars = message_preview_chars
         self.tool_preview_chars = tool_preview_chars
         self.log_model_calls = log_model_calls
+        # Hook logging is on the agent's critical path; keep only the
+        # enqueue there and let the listener threads do the actual I/O
+        self._queue_listeners = [
+            listener
+            for listener in (
+                _start_queue_logging(self.model_logger),
+                _start_queue_logging(self.tool_logger),
+            )
+            if listener is not None
+        ]
+        # Last-written signature per message key; lets after_model skip the
+        # storage round-trip when the history hasn't grown since last turn
+        self._last_written: dict[str, tuple] = {}
 
     def after_model(self, hook_input: AfterModelHookInput) -> HookResult:  # type: ignore[override]
         # save all messages to global storage
@@ -58,45 +140,56 @@ class LoggingMiddleware(Middleware):
         global_storage = hook_input.agent_state.global_storage
         messages = hook_input.messages
         message_key = f"{agent_name}_{agent_id}_messages"
-        with global_storage.lock_key(message_key):
-            global_storage.set(message_key, messages)
+        # New messages always extend the list, so length plus the identity
+        # and role of the tail is enough to detect an unchanged history
+        sig = (
+            len(messages),
+            messages[-1].get("role") if messages else None,
+            id(messages[-1]) if messages else 0,
+        )
+        if self._last_written.get(message_key) != sig:
+            with global_storage.lock_key(message_key):
+                global_storage.set(message_key, messages)
+            self._last_written[message_key] = sig
 
         logger = self.model_logger
-        if not logger:
+        # Skip the whole formatting block (summaries, previews, len() calls)
+        # when nothing would be emitted anyway
+        if not logger or not logger.isEnabledFor(logging.INFO):
             return HookResult.no_changes()
 
         parsed = hook_input.parsed_response
-        logger.info("🎣 ===== AFTER MODEL HOOK TRIGGERED =====")
-        logger.info(
-            "Agent: %s (%s)",
-            hook_input.agent_state.agent_name,
-            hook_input.agent_state.agent_id,
-        )
-        logger.info("Response length: %s characters", len(hook_input.original_response))
+        lines = [
+            "🎣 ===== AFTER MODEL HOOK TRIGGERED =====",
+            f"Agent: {agent_name} ({agent_id})",
+            f"Response length: {len(hook_input.original_response)} characters",
+        ]
 
         if parsed is None:
-            logger.info("No parsed response available")
+            lines.append("No parsed response available")
         else:
-            logger.info("Summary: %s", parsed.get_call_summary())
-            logger.info("Tool calls: %s", len(parsed.tool_calls))
-            logger.info("Sub-agent calls: %s", len(parsed.sub_agent_calls))
-            logger.info("Batch agent calls: %s", len(parsed.batch_agent_calls))
-            logger.info("Parallel tools: %s", parsed.is_parallel_tools)
-            logger.info("Parallel sub-agents: %s", parsed.is_parallel_sub_agents)
-
-        logger.info("Message history: %s items", len(hook_input.messages))
-        for idx, msg in enumerate(hook_input.messages[-3:]):
+            lines.append(f"Summary: {parsed.get_call_summary()}")
+            lines.append(f"Tool calls: {len(parsed.tool_calls)}")
+            lines.append(f"Sub-agent calls: {len(parsed.sub_agent_calls)}")
+            lines.append(f"Batch agent calls: {len(parsed.batch_agent_calls)}")
+            lines.append(f"Parallel tools: {parsed.is_parallel_tools}")
+            lines.append(f"Parallel sub-agents: {parsed.is_parallel_sub_agents}")
+
+        lines.append(f"Message history: {len(messages)} items")
+        for idx, msg in enumerate(messages[-3:]):
             preview = str(msg.get("content", ""))[: self.message_preview_chars]
-            logger.info(
-                "Recent message %s: %s -> %s", idx + 1, msg.get("role"), preview
-            )
+            lines.append(f"Recent message {idx + 1}: {msg.get('role')} -> {preview}")
 
-        logger.info("🎣 ===== END AFTER MODEL HOOK =====")
+        lines.append("🎣 ===== END AFTER MODEL HOOK =====")
+        # One multi-line record: one handler lock cycle and one write
+        # instead of roughly ten
+        logger.info("\n".join(lines))
         return HookResult.no_changes()
 
     def after_tool(self, hook_input: AfterToolHookInput) -> HookResult:  # type: ignore[override]
         logger = self.tool_logger
-        if not logger:
+        # Tool outputs can be large; only stringify them when INFO is on
+        if not logger or not logger.isEnabledFor(logging.INFO):
             return HookResult.no_changes()
 
         logger.info("🔧 ===== AFTER TOOL HOOK TRIGGERED =====")
@@ -151,7 +244,10 @@ class ContinueResearchMiddleware(Middleware):
     """Middleware that logs after-model and/or after-tool phases."""
 
     def __init__(
-        self, continue_judge_agent_config_path: str, max_continue_times: int = 5
+        self,
+        continue_judge_agent_config_path: str,
+        max_continue_times: int = 5,
+        judge_timeout_s: float = 30.0,
     ) -> None:
         self.continue_judge_agent_config_path = continue_judge_agent_config_path
         assert os.path.exists(self.continue_judge_agent_config_path), (
@@ -159,6 +255,14 @@ class ContinueResearchMiddleware(Middleware):
         )
         self.max_continue_times = max_continue_times
         self.continue_times = 0
+        self.judge_timeout_s = judge_timeout_s
+        # Judge agent cached across hook invocations; reloading the config
+        # (parse + agent init) every turn is pure overhead
+        self._judge_agent = None
+        self._judge_storage_id = None
+        # Single worker bounds how long a slow judge can stall the turn;
+        # calls past the timeout are abandoned rather than awaited
+        self._executor = ThreadPoolExecutor(max_workers=1)
 
     def after_model(self, hook_input: AfterModelHookInput) -> HookResult:  # type: ignore[override]
         # Check if the parsed response is None or has no tool calls
@@ -173,13 +277,13 @@ class ContinueResearchMiddleware(Middleware):
                 logger.info(
                     f"Continue judge determined research incomplete: {judge_reason}"
                 )
-                # Append user message with the reason to messages
-                modified_messages = hook_input.messages.copy()
+                # Append user message with the reason to messages; one
+                # allocation instead of copy-then-resize-append
                 feedback_message = {
                     "role": "user",
                     "content": f"<system_reminder>\nYour research is not yet complete. Please continue with more investigation.\n\nReason: {judge_reason}\n</system_reminder>",
                 }
-                modified_messages.append(feedback_message)
+                modified_messages = [*hook_input.messages, feedback_message]
                 # delete handoff_to_report_writer tool call
                 hook_input.parsed_response.tool_calls = [
                     tool_call
@@ -210,28 +314,45 @@ class ContinueResearchMiddleware(Middleware):
             return False, "Max continue times reached"
 
         self.continue_times += 1
-        agent = load_agent_config(
-            self.continue_judge_agent_config_path,
-            global_storage=hook_input.agent_state.global_storage,
-        )
+        global_storage = hook_input.agent_state.global_storage
+        if self._judge_agent is None or self._judge_storage_id != id(global_storage):
+            self._judge_agent = load_agent_config(
+                self.continue_judge_agent_config_path,
+                global_storage=global_storage,
+            )
+            self._judge_storage_id = id(global_storage)
+        agent = self._judge_agent
         system_reminder = "Please judge if the research agent has completed all required research tasks comprehensively."
         input_history = hook_input.messages[1:]  # index-0 is the system message
-        input_message = ""
+        # Collect parts and join once; += on a str re-copies the whole
+        # buffer every turn of a long transcript. Stop once the prompt
+        # budget is spent rather than serializing the full history
+        parts = []
+        remaining = _HISTORY_CHAR_BUDGET
         for message in input_history:
             role = message["role"]
             content = message.get("content", "")
             if content:
-                input_message += f"<{role}>\n{content}\n</{role}>\n\n"
+                part = f"<{role}>\n{content}\n</{role}>\n\n"
+                parts.append(part)
+                remaining -= len(part)
+                if remaining <= 0:
+                    break
+        input_message = "".join(parts)
 
         user_message = f"<system_reminder>\n{system_reminder}\n</system_reminder>\n\n<research_history>\n{input_message}\n</research_history>"
-        response_content = agent.run(user_message)
+        future = self._executor.submit(agent.run, user_message)
+        try:
+            response_content = future.result(timeout=self.judge_timeout_s)
+        except FuturesTimeoutError:
+            # A slow judge must not stall the pipeline; let research finish
+            logger.warning(
+                f"Continue judge timed out after {self.judge_timeout_s}s, letting research proceed"
+            )
+            return True, ""
 
         # Extract judge_result (case-insensitive, flexible matching)
-        judge_result_match = re.search(
-            r"<judge_result[^>]*>\s*(true|false|yes|no|1|0)\s*</judge_result>",
-            response_content,
-            re.IGNORECASE | re.DOTALL,
-        )
+        judge_result_match = _JUDGE_RESULT_RE.search(response_content)
         if not judge_result_match:
             logger.warning(
                 f"Continue judge agent response missing <judge_result> tag. Response: {response_content}"
@@ -245,11 +366,7 @@ class ContinueResearchMiddleware(Middleware):
         # Extract judge_reason if result is False (more flexible matching)
         judge_reason = ""
         if not judge_result:
-            judge_reason_match = re.search(
-                r"<judge_reason[^>]*>\s*(.*?)\s*</judge_reason>",
-                response_content,
-                re.IGNORECASE | re.DOTALL,
-            )
+            judge_reason_match = _JUDGE_REASON_RE.search(response_content)
             if judge_reason_match:
                 judge_reason = judge_reason_match.group(1).strip()
             else:
@@ -267,6 +384,7 @@ class TodoValidationMiddleware(Middleware):
         max_validation_times: int = 10,
         validate_every_n_calls: int = 1,
         skip_first_n_calls: int = 0,
+        validator_timeout_s: float = 30.0,
     ) -> None:
         """
         Initialize TodoValidationMiddleware.
@@ -276,6 +394,7 @@ class TodoValidationMiddleware(Middleware):
             max_validation_times: Maximum number of validations to perform
             validate_every_n_calls: Validate every N TodoWrite calls (1 = validate all)
             skip_first_n_calls: Skip validation for the first N TodoWrite calls
+            validator_timeout_s: Seconds to wait for the validator before failing open
         """
         self.todo_validator_agent_config_path = todo_validator_agent_config_path
         assert os.path.exists(self.todo_validator_agent_config_path), (
@@ -285,11 +404,18 @@ class TodoValidationMiddleware(Middleware):
         self.max_validation_times = max_validation_times
         self.validate_every_n_calls = validate_every_n_calls
         self.skip_first_n_calls = skip_first_n_calls
+        self.validator_timeout_s = validator_timeout_s
 
         # State tracking
         self.validation_count = 0
         self.todo_write_call_count = 0
 
+        # Validator agent cached across validations (it carries no shared
+        # state, so one instance serves every call)
+        self._validator_agent = None
+        # Single worker bounds how long a slow validator can stall the turn
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
     def after_model(self, hook_input: AfterModelHookInput) -> HookResult:  # type: ignore[override]
         """Validate TodoWrite calls after model response."""
 
@@ -363,9 +489,11 @@ class TodoValidationMiddleware(Middleware):
                 if call.tool_name != "TodoWrite"
             ]
 
-            # Add feedback message
-            modified_messages = hook_input.messages.copy()
-            modified_messages.append({"role": "user", "content": feedback})
+            # Add feedback message in one allocation
+            modified_messages = [
+                *hook_input.messages,
+                {"role": "user", "content": feedback},
+            ]
 
             logger.info("🎯 TodoWrite validation completed with modifications")
             return HookResult.with_modifications(
@@ -390,14 +518,18 @@ class TodoValidationMiddleware(Middleware):
         Returns:
             (is_valid, feedback): Whether valid and feedback message if invalid
         """
-        # Load validator agent
-        agent = load_agent_config(
-            self.todo_validator_agent_config_path,
-            global_storage=None,  # Validator doesn't need shared state
-        )
+        # Load validator agent once and reuse it
+        if self._validator_agent is None:
+            self._validator_agent = load_agent_config(
+                self.todo_validator_agent_config_path,
+                global_storage=None,  # Validator doesn't need shared state
+            )
+        agent = self._validator_agent
 
-        # Prepare context from messages
+        # Prepare context from messages, stopping once the prompt budget
+        # is spent
         conversation_context = []
+        remaining = _HISTORY_CHAR_BUDGET
         for msg in messages[1:]:  # Skip system message
             role = msg.get("role", "unknown")
             content = msg.get("content", "")
@@ -407,9 +539,11 @@ class TodoValidationMiddleware(Middleware):
                 content = content[:4000] + "\n...[truncated]...\n" + content[-4000:]
 
             if content:
-                conversation_context.append(
-                    f"<{role.upper()}>\n{content}\n</{role.upper()}>"
-                )
+                part = f"<{role.upper()}>\n{content}\n</{role.upper()}>"
+                conversation_context.append(part)
+                remaining -= len(part)
+                if remaining <= 0:
+                    break
 
         conversation_str = "\n\n".join(conversation_context)
 
@@ -441,9 +575,16 @@ Please evaluate if the TodoWrite tool call(s) below are reasonable and appropria
 
 Please evaluate and provide your judgment."""
 
-        # Call validator agent
+        # Call validator agent with a bounded wait; fail open on timeout
         logger.info("🎯 Calling validator agent...")
-        response_content = agent.run(validation_request)
+        future = self._executor.submit(agent.run, validation_request)
+        try:
+            response_content = future.result(timeout=self.validator_timeout_s)
+        except FuturesTimeoutError:
+            logger.warning(
+                f"🎯 Validator timed out after {self.validator_timeout_s}s, accepting TodoWrite"
+            )
+            return True, ""
         logger.info(f"🎯 Validator response: {response_content[:200]}...")
 
         # Parse response using XML tags
@@ -466,42 +607,26 @@ Please evaluate and provide your judgment."""
         Returns:
             (is_valid, feedback): Whether valid and feedback message if invalid
         """
-        # Extract validation_result (case-insensitive)
-        result_match = re.search(
-            r"<validation_result[^>]*>\s*(true|false|yes|no|1|0)\s*</validation_result>",
-            response,
-            re.IGNORECASE | re.DOTALL,
-        )
+        # One pass over the response collects every validation_* tag
+        tags: dict[str, str] = {}
+        for match in _VALIDATOR_RE.finditer(response):
+            tags[match.group("tag").lower()] = match.group("val")
 
-        if not result_match:
+        result_value = tags.get("result", "").lower().strip()
+        if result_value not in ("true", "false", "yes", "no", "1", "0"):
             logger.warning(
                 f"Validator response missing <validation_result> tag. Response: {response}"
             )
             # Default to valid on parse error to avoid blocking
             return True, ""
 
-        # Parse result value
-        result_value = result_match.group(1).lower().strip()
         is_valid = result_value in ["true", "yes", "1"]
 
         if is_valid:
             return True, ""
 
-        # Extract reason and suggestion
-        reason_match = re.search(
-            r"<validation_reason[^>]*>\s*(.*?)\s*</validation_reason>",
-            response,
-            re.IGNORECASE | re.DOTALL,
-        )
-
-        suggestion_match = re.search(
-            r"<validation_suggestion[^>]*>\s*(.*?)\s*</validation_suggestion>",
-            response,
-            re.IGNORECASE | re.DOTALL,
-        )
-
-        reason = reason_match.group(1).strip() if reason_match else ""
-        suggestion = suggestion_match.group(1).strip() if suggestion_match else ""
+        reason = tags.get("reason", "").strip()
+        suggestion = tags.get("suggestion", "").strip()
 
         # Build feedback message
         feedback_parts = ["⚠️ **TodoWrite Validation Failed**"]
@@ -546,6 +671,8 @@ class TodoAndContinueMiddleware(Middleware):
         min_compress_tokens: int = 500,
         token_counter_strategy: str = "tiktoken",
         token_counter_model: str = "gpt-4o",
+        validator_timeout_s: float = 30.0,
+        judge_timeout_s: float = 30.0,
     ) -> None:
         """
         Initialize TodoAndContinueMiddleware.
@@ -563,6 +690,8 @@ class TodoAndContinueMiddleware(Middleware):
             min_compress_tokens: Minimum token count for a message to be eligible for compression
             token_counter_strategy: Token counting strategy ("tiktoken" or "fallback")
             token_counter_model: Model name for token counter (e.g., "gpt-4o")
+            validator_timeout_s: Seconds to wait for the validator before failing open
+            judge_timeout_s: Seconds to wait for the continue judge before failing open
         """
         # Todo validation config
         self.todo_validator_agent_config_path = todo_validator_agent_config_path
@@ -601,14 +730,40 @@ class TodoAndContinueMiddleware(Middleware):
         self.todo_write_call_count = 0
         self.continue_times = 0
 
+        # Judge/validator agents cached across hook invocations; reloading
+        # the configs every turn is pure overhead
+        self._judge_agent = None
+        self._judge_storage_id = None
+        self._validator_agent = None
+
+        # Per-message token counts keyed by dict identity; messages are
+        # appended, not edited, so only new ones need tokenizing each turn
+        self._token_cache: dict[int, int] = {}
+
+        # Bounded judge/validator calls; two workers so an abandoned
+        # timed-out call can't head-of-line block the next one
+        self.validator_timeout_s = validator_timeout_s
+        self.judge_timeout_s = judge_timeout_s
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
     def before_model(self, hook_input: BeforeModelHookInput) -> HookResult:  # type: ignore[override]
         """
         Check context size and compress old user messages if necessary.
         """
         messages = hook_input.messages
 
-        # Calculate total context size using TokenCounter
-        total_tokens = self.token_counter.count_tokens(messages)
+        # Cheap pre-check: at >= ~3 chars per token, a character total this
+        # far under the budget proves compression can't be needed without
+        # paying for BPE at all
+        char_total = sum(len(m.get("content") or "") for m in messages)
+        if char_total < self.max_context_tokens * 3:
+            logger.info(
+                f"📊 Context well under limit ({char_total} chars), skipping token count"
+            )
+            return HookResult.no_changes()
+
+        # Calculate total context size, tokenizing only unseen messages
+        total_tokens = self._count_tokens_cached(messages)
 
         logger.info(
             f"📊 Current context size: {total_tokens} tokens (max: {self.max_context_tokens})"
@@ -627,14 +782,42 @@ class TodoAndContinueMiddleware(Middleware):
             messages=messages, agent_state=hook_input.agent_state
         )
 
-        # Calculate new size using TokenCounter
-        new_tokens = self.token_counter.count_tokens(compressed_messages)
+        # Calculate new size; replaced messages are fresh dicts and get
+        # counted, untouched ones hit the cache
+        new_tokens = self._count_tokens_cached(compressed_messages)
         logger.info(
             f"✅ Compression complete. New context size: {new_tokens} tokens (saved: {total_tokens - new_tokens} tokens)"
         )
 
         return HookResult.with_modifications(messages=compressed_messages)
 
+    def _count_tokens_cached(self, messages: list) -> int:
+        """Sum token counts, tokenizing only messages not seen before.
+
+        Message dicts are appended rather than edited, so their identity is
+        a stable cache key and each message is tokenized once instead of
+        the whole history being re-tokenized every turn.
+        """
+        total = 0
+        live_ids = set()
+        for message in messages:
+            key = id(message)
+            live_ids.add(key)
+            count = self._token_cache.get(key)
+            if count is None:
+                count = self.token_counter.count_tokens([message])
+                self._token_cache[key] = count
+            total += count
+        if len(self._token_cache) > 2 * len(messages):
+            # Prune entries for dicts no longer in the history so recycled
+            # ids from collected objects can't resolve to stale counts
+            self._token_cache = {
+                key: value
+                for key, value in self._token_cache.items()
+                if key in live_ids
+            }
+        return total
+
     def after_model(self, hook_input: AfterModelHookInput) -> HookResult:  # type: ignore[override]
         """
         Combined logic: first validate TodoWrite, then judge continue if no TodoWrite.
@@ -730,9 +913,11 @@ class TodoAndContinueMiddleware(Middleware):
                 if call.tool_name != "TodoWrite"
             ]
 
-            # Add feedback message
-            modified_messages = hook_input.messages.copy()
-            modified_messages.append({"role": "user", "content": feedback})
+            # Add feedback message in one allocation
+            modified_messages = [
+                *hook_input.messages,
+                {"role": "user", "content": feedback},
+            ]
 
             logger.info("🎯 TodoWrite validation completed with modifications")
             return HookResult.with_modifications(
@@ -761,13 +946,13 @@ class TodoAndContinueMiddleware(Middleware):
                 logger.info(
                     f"Continue judge determined research incomplete: {judge_reason}"
                 )
-                # Append user message with the reason to messages
-                modified_messages = hook_input.messages.copy()
+                # Append user message with the reason to messages; one
+                # allocation instead of copy-then-resize-append
                 feedback_message = {
                     "role": "user",
                     "content": f"<system_reminder>\nYour research is not yet complete. Please continue with more investigation.\n\nReason: {judge_reason}\n</system_reminder>",
                 }
-                modified_messages.append(feedback_message)
+                modified_messages = [*hook_input.messages, feedback_message]
                 # delete handoff_to_report_writer tool call
                 hook_input.parsed_response.tool_calls = [
                     tool_call
@@ -800,30 +985,46 @@ class TodoAndContinueMiddleware(Middleware):
             return True, "Max continue times reached"
 
         self.continue_times += 1
-        agent = load_agent_config(
-            self.continue_judge_agent_config_path,
-            global_storage=hook_input.agent_state.global_storage,
-        )
+        global_storage = hook_input.agent_state.global_storage
+        if self._judge_agent is None or self._judge_storage_id != id(global_storage):
+            self._judge_agent = load_agent_config(
+                self.continue_judge_agent_config_path,
+                global_storage=global_storage,
+            )
+            self._judge_storage_id = id(global_storage)
+        agent = self._judge_agent
         system_reminder = "Please judge if the research agent has completed all required research tasks comprehensively."
         input_history = hook_input.messages[1:]  # index-0 is the system message
-        input_message = ""
+        # Collect parts and join once instead of quadratic str +=; stop
+        # once the prompt budget is spent
+        parts = []
+        remaining = _HISTORY_CHAR_BUDGET
         for message in input_history:
             role = message["role"]
             content = message.get("content", "")
             if len(content) > 8000:
                 content = content[:4000] + "\n...[truncated]...\n" + content[-4000:]
             if content:
-                input_message += f"<{role}>\n{content}\n</{role}>\n\n"
+                part = f"<{role}>\n{content}\n</{role}>\n\n"
+                parts.append(part)
+                remaining -= len(part)
+                if remaining <= 0:
+                    break
+        input_message = "".join(parts)
 
         user_message = f"<system_reminder>\n{system_reminder}\n</system_reminder>\n\n<research_history>\n{input_message}\n</research_history>"
-        response_content = agent.run(user_message)
+        future = self._executor.submit(agent.run, user_message)
+        try:
+            response_content = future.result(timeout=self.judge_timeout_s)
+        except FuturesTimeoutError:
+            # A slow judge must not stall the pipeline; let research finish
+            logger.warning(
+                f"Continue judge timed out after {self.judge_timeout_s}s, letting research proceed"
+            )
+            return True, ""
 
         # Extract judge_result (case-insensitive, flexible matching)
-        judge_result_match = re.search(
-            r"<judge_result[^>]*>\s*(true|false|yes|no|1|0)\s*</judge_result>",
-            response_content,
-            re.IGNORECASE | re.DOTALL,
-        )
+        judge_result_match = _JUDGE_RESULT_RE.search(response_content)
         if not judge_result_match:
             logger.warning(
                 f"Continue judge agent response missing <judge_result> tag. Response: {response_content}"
@@ -837,11 +1038,7 @@ class TodoAndContinueMiddleware(Middleware):
         # Extract judge_reason if result is False (more flexible matching)
         judge_reason = ""
         if not judge_result:
-            judge_reason_match = re.search(
-                r"<judge_reason[^>]*>\s*(.*?)\s*</judge_reason>",
-                response_content,
-                re.IGNORECASE | re.DOTALL,
-            )
+            judge_reason_match = _JUDGE_REASON_RE.search(response_content)
             if judge_reason_match:
                 judge_reason = judge_reason_match.group(1).strip()
             else:
@@ -862,14 +1059,18 @@ class TodoAndContinueMiddleware(Middleware):
         Returns:
             (is_valid, feedback): Whether valid and feedback message if invalid
         """
-        # Load validator agent
-        agent = load_agent_config(
-            self.todo_validator_agent_config_path,
-            global_storage=None,  # Validator doesn't need shared state
-        )
+        # Load validator agent once and reuse it
+        if self._validator_agent is None:
+            self._validator_agent = load_agent_config(
+                self.todo_validator_agent_config_path,
+                global_storage=None,  # Validator doesn't need shared state
+            )
+        agent = self._validator_agent
 
-        # Prepare context from messages
+        # Prepare context from messages, stopping once the prompt budget
+        # is spent
         conversation_context = []
+        remaining = _HISTORY_CHAR_BUDGET
         for msg in messages[1:]:  # Skip system message
             role = msg.get("role", "unknown")
             content = msg.get("content", "")
@@ -879,9 +1080,11 @@ class TodoAndContinueMiddleware(Middleware):
                 content = content[:4000] + "\n...[truncated]...\n" + content[-4000:]
 
             if content:
-                conversation_context.append(
-                    f"<{role.upper()}>\n{content}\n</{role.upper()}>"
-                )
+                part = f"<{role.upper()}>\n{content}\n</{role.upper()}>"
+                conversation_context.append(part)
+                remaining -= len(part)
+                if remaining <= 0:
+                    break
 
         conversation_str = "\n\n".join(conversation_context)
 
@@ -913,9 +1116,16 @@ Please evaluate if the TodoWrite tool call(s) below are reasonable and appropria
 
 Please evaluate and provide your judgment."""
 
-        # Call validator agent
+        # Call validator agent with a bounded wait; fail open on timeout
         logger.info("🎯 Calling validator agent...")
-        response_content = agent.run(validation_request)
+        future = self._executor.submit(agent.run, validation_request)
+        try:
+            response_content = future.result(timeout=self.validator_timeout_s)
+        except FuturesTimeoutError:
+            logger.warning(
+                f"🎯 Validator timed out after {self.validator_timeout_s}s, accepting TodoWrite"
+            )
+            return True, ""
         logger.info(f"🎯 Validator response: {response_content[:200]}...")
 
         # Parse response using XML tags
@@ -938,42 +1148,26 @@ Please evaluate and provide your judgment."""
         Returns:
             (is_valid, feedback): Whether valid and feedback message if invalid
         """
-        # Extract validation_result (case-insensitive)
-        result_match = re.search(
-            r"<validation_result[^>]*>\s*(true|false|yes|no|1|0)\s*</validation_result>",
-            response,
-            re.IGNORECASE | re.DOTALL,
-        )
+        # One pass over the response collects every validation_* tag
+        tags: dict[str, str] = {}
+        for match in _VALIDATOR_RE.finditer(response):
+            tags[match.group("tag").lower()] = match.group("val")
 
-        if not result_match:
+        result_value = tags.get("result", "").lower().strip()
+        if result_value not in ("true", "false", "yes", "no", "1", "0"):
             logger.warning(
                 f"Validator response missing <validation_result> tag. Response: {response}"
             )
             # Default to valid on parse error to avoid blocking
             return True, ""
 
-        # Parse result value
-        result_value = result_match.group(1).lower().strip()
         is_valid = result_value in ["true", "yes", "1"]
 
         if is_valid:
             return True, ""
 
-        # Extract reason and suggestion
-        reason_match = re.search(
-            r"<validation_reason[^>]*>\s*(.*?)\s*</validation_reason>",
-            response,
-            re.IGNORECASE | re.DOTALL,
-        )
-
-        suggestion_match = re.search(
-            r"<validation_suggestion[^>]*>\s*(.*?)\s*</validation_suggestion>",
-            response,
-            re.IGNORECASE | re.DOTALL,
-        )
-
-        reason = reason_match.group(1).strip() if reason_match else ""
-        suggestion = suggestion_match.group(1).strip() if suggestion_match else ""
+        reason = tags.get("reason", "").strip()
+        suggestion = tags.get("suggestion", "").strip()
 
         # Build feedback message
         feedback_parts = ["⚠️ **TodoWrite Validation Failed**"]